@@ -1,18 +1,111 @@
 import os
+import tempfile
+import threading
 
 TODO_FILE = "todo.txt"
+SAVE_DELAY = 2.0  # Seconds after a change until it is written to the file
 
 def load_tasks():
   if not os.path.exists(TODO_FILE):
     return []
   with open(TODO_FILE, 'r') as file:
-    return [line.strip() for line in file.readlines()]
-  
+    return file.read().splitlines()
+
+def fsync_directory(directory):
+  # Makes a rename in the directory durable (not possible on Windows)
+  try:
+    fd = os.open(directory, os.O_RDONLY)
+  except OSError:
+    return
+  try:
+    os.fsync(fd)
+  except OSError:
+    pass
+  finally:
+    os.close(fd)
+
 def save_todos(todos):
-  with open(TODO_FILE,'w') as file:
-    for todo in todos:
-      file.write(todo + "\n")
-    
+  # Write the whole list to a temporary file of our own, flush it to disk, then
+  # rename it over todo.txt: a crash leaves either the old list or the new one,
+  # never half of it, and two running copies never share a temporary file
+  directory = os.path.dirname(os.path.abspath(TODO_FILE))
+  fd, temp_file = tempfile.mkstemp(prefix="." + os.path.basename(TODO_FILE) + ".", suffix=".tmp", dir=directory)
+  try:
+    with os.fdopen(fd, 'w') as file:
+      file.write("".join(todo + "\n" for todo in todos))
+      file.flush()
+      os.fsync(file.fileno())
+    if os.path.exists(TODO_FILE):
+      os.chmod(temp_file, os.stat(TODO_FILE).st_mode & 0o777)  # mkstemp creates files as 0600
+    os.replace(temp_file, TODO_FILE)
+  except BaseException:
+    if os.path.exists(temp_file):
+      os.remove(temp_file)
+    raise
+  fsync_directory(directory)
+
+
+class TodoStore:
+  """
+  Keeps todo.txt in memory so commands don't read and write the whole file.
+
+  The file is loaded once. Before each command we compare its inode, size
+  and mtime with what we loaded, and reload only if another program changed
+  it. A timer writes changes back SAVE_DELAY seconds after the first unsaved
+  one, even while the prompt waits for input, and they are always saved on exit.
+  """
+
+  def __init__(self):
+    self.todos = []
+    self.stamp = None
+    self.dirty = False
+    self.timer = None  # Pending save, started by the first unsaved change
+    self.lock = threading.Lock()
+    self.load()
+
+  def file_stamp(self):
+    try:
+      stat = os.stat(TODO_FILE)
+    except FileNotFoundError:
+      return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+  def load(self):
+    self.todos = load_tasks()
+    self.stamp = self.file_stamp()
+    self.dirty = False
+
+  def refresh(self):
+    """Reload the file if someone else changed it since we last read or wrote it."""
+    with self.lock:
+      if self.file_stamp() == self.stamp:
+        return
+      if not self.dirty:
+        self.load()
+      else:
+        print(f"Warning: {TODO_FILE} was changed by another program; your changes will replace it.")
+        self.stamp = self.file_stamp()
+
+  def changed(self):
+    with self.lock:
+      self.dirty = True
+      if self.timer is None:
+        self.timer = threading.Timer(SAVE_DELAY, self.save)
+        self.timer.daemon = True
+        self.timer.start()
+
+  def save(self):
+    """Write unsaved changes now (also called by the timer)."""
+    with self.lock:
+      if self.timer is not None:
+        self.timer.cancel()
+        self.timer = None
+      if self.dirty:
+        save_todos(list(self.todos))
+        self.stamp = self.file_stamp()
+        self.dirty = False
+
+
 def disply_query():
   print(".............................")
   print("1 view todo list")
@@ -20,65 +113,68 @@ def disply_query():
   print("3 edit todo")
   print("4 delete todo")
   print("5 Exit from todo app.")
-  
-def view_todo_list():
-  todos = load_tasks()
+
+def view_todo_list(store):
+  todos = store.todos
   if not todos:
     print("Todo list is empty!")
   else:
-    for i, todo in enumerate(todos, 1):
-      print(f"{i}. {todo}")
-  
-def add_todo():
+    print("\n".join(f"{i}. {todo}" for i, todo in enumerate(todos, 1)))
+
+def add_todo(store):
   todo = input("Enter todo: ")
-  todos = load_tasks()
-  todos.append(todo)
-  save_todos(todos)
+  store.todos.append(todo)
+  store.changed()
   print(f"{todo} added successfully!")
-  
-  
-def edit_todo():
-  todos = load_tasks()
-  view_todo_list()
+
+
+def edit_todo(store):
+  todos = store.todos
+  view_todo_list(store)
   change_todo_in_list = int(input("Change your choice to edit todo: "))-1
-  if change_todo_in_list >= 0 and len(todos) >= change_todo_in_list:
+  if 0 <= change_todo_in_list < len(todos):
     new_todo = input("Enter updated todo: ")
     todos[change_todo_in_list] = new_todo
-    save_todos(todos)
+    store.changed()
     print("Todo updated successfully!")
   else:
     print("Invalid choice!")
-  
-def delete_todo():
-  todos = load_tasks()
-  view_todo_list()
+
+def delete_todo(store):
+  todos = store.todos
+  view_todo_list(store)
   delete_todo_in_list = int(input("Enter which todo want to delete: "))-1
-  if delete_todo_in_list >= 0 and len(todos) >= delete_todo_in_list:
+  if 0 <= delete_todo_in_list < len(todos):
     todos.pop(delete_todo_in_list)
-    save_todos(todos)
+    store.changed()
     print("todo is deleted succesfully")
   else:
     print("Invalid choice!")
 
 
 def main():
-  while True:
-    disply_query()
-    choice = int(input("Enter your choice (1-5): "))
-    if (choice == 1):
-      view_todo_list()
-    elif (choice == 2):
-      add_todo()
-    elif (choice == 3):
-      edit_todo()
-    elif (choice == 4):
-      delete_todo()
-    elif (choice == 5):
-      print("Thank you for participating. Goodbye!")
-      break
-    else:
-      print("Invalid choice! Please try between (1-5).")
+  store = TodoStore()
+  try:
+    while True:
+      disply_query()
+      choice = int(input("Enter your choice (1-5): "))
+      store.refresh()
+      if (choice == 1):
+        view_todo_list(store)
+      elif (choice == 2):
+        add_todo(store)
+      elif (choice == 3):
+        edit_todo(store)
+      elif (choice == 4):
+        delete_todo(store)
+      elif (choice == 5):
+        print("Thank you for participating. Goodbye!")
+        break
+      else:
+        print("Invalid choice! Please try between (1-5).")
+  finally:
+    store.save()  # Also on Ctrl+C or an error
 
 
 if __name__ == "__main__":
-  main()
\ No newline at end of file
+  main()
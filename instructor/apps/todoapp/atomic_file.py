@@ -0,0 +1,110 @@
+"""
+Crash-safe saving for the text-based todo stores.
+
+atomic_write() never touches the live file: the whole new content is
+written to a temporary file in the same directory, flushed to disk with
+fsync, and then renamed over the old file. A rename within one directory
+is atomic, so after a crash the file holds either the old list or the new
+one, never an empty or half-written one.
+
+BackgroundWriter does the same from a worker thread, so saving does not
+hold up the caller. Only the newest content of each file is kept while a
+write is in progress; older versions that were never written are skipped.
+"""
+import atexit
+import os
+import tempfile
+import threading
+
+
+def fsync_directory(directory):
+    """Makes a rename in the directory durable. Not possible on Windows."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, data, fsync=True, encoding="utf-8"):
+    """
+    Replaces the file at path with data (str or bytes) in one write. data can
+    also be an iterable of them, to write a big file piece by piece. With
+    fsync=False it is still atomic, but the new content may be lost on a
+    power failure.
+    """
+    if isinstance(data, (str, bytes, bytearray)):
+        data = [data]
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix="." + os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            for part in data:
+                file.write(part.encode(encoding) if isinstance(part, str) else part)
+            file.flush()
+            if fsync:
+                os.fsync(file.fileno())
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode & 0o777)  # mkstemp creates files as 0600
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if fsync:
+        fsync_directory(directory)
+
+
+class BackgroundWriter:
+    """Runs atomic_write() on a worker thread (double buffering)."""
+
+    def __init__(self, fsync=True):
+        self.fsync = fsync
+        self.pending = {}  # path -> newest data not yet written
+        self.writing = False
+        self.error = None
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, path, data):
+        """Queues data to be written to path and returns at once."""
+        with self.condition:
+            self.raise_error()
+            self.pending[path] = data
+            self.condition.notify_all()
+
+    def flush(self):
+        """Waits until everything submitted so far is on disk."""
+        with self.condition:
+            while self.pending or self.writing:
+                self.condition.wait()
+            self.raise_error()
+
+    def raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                path = next(iter(self.pending))
+                data = self.pending.pop(path)
+                self.writing = True
+            try:
+                atomic_write(path, data, self.fsync)
+            except Exception as error:
+                with self.condition:
+                    self.error = error  # Raised in the caller's thread on the next call
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
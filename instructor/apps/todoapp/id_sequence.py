@@ -0,0 +1,69 @@
+"""
+Task IDs that only ever go up, so a deleted task's ID is never handed out
+again.
+
+IdSequence gives out IDs from a counter in O(1). With a path it is also
+saved next to the data file (e.g. todo_list.txt.seq), but not after every
+ID: it reserves a block of ID_BLOCK IDs at a time and saves only the end of
+the block. After a crash the unused rest of a block is skipped, never
+reused; close() gives it back on a clean exit. reserve(count) hands out
+a whole run of IDs at once for batch inserts.
+
+The saved value is a lower bound. Stores call advance_past() with the
+highest ID they loaded, so a missing or outdated .seq file (for example
+after an import into the data file) can never cause a collision.
+"""
+import os
+
+from atomic_file import atomic_write
+
+ID_BLOCK = 64
+
+
+def sequence_path(data_path):
+    """Returns where the ID sequence of a data file is stored."""
+    return data_path + ".seq"
+
+
+class IdSequence:
+    """A monotonic task ID counter, optionally persisted in blocks."""
+
+    def __init__(self, path=None, block=ID_BLOCK):
+        self.path = path
+        self.block = block
+        self.next_id = 1
+        self.limit = 1  # IDs below this are already reserved on disk
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as file:
+                    self.next_id = self.limit = max(1, int(file.read().strip()))
+            except ValueError:
+                pass  # Damaged file: advance_past() restores a safe value
+
+    def reserve(self, count=1):
+        """Hands out `count` consecutive IDs as a range."""
+        start = self.next_id
+        self.next_id += count
+        if self.next_id > self.limit:
+            self.limit = self.next_id + self.block
+            self.save()
+        return range(start, self.next_id)
+
+    def allocate(self):
+        """Hands out one ID."""
+        return self.reserve(1).start
+
+    def advance_past(self, task_id):
+        """Makes sure IDs handed out from now on are greater than task_id."""
+        if task_id >= self.next_id:
+            self.next_id = task_id + 1
+
+    def close(self):
+        """Gives back the unused rest of the block, so the next run continues from here."""
+        if self.limit != self.next_id:
+            self.limit = self.next_id
+            self.save()
+
+    def save(self):
+        if self.path:
+            atomic_write(self.path, f"{self.limit}\n")
@@ -0,0 +1,209 @@
+"""
+Reading and writing the pipe-delimited task files (todo_list.txt, todos.txt).
+
+One task per line: id|title|completed, optionally followed by |priority.
+Inside a field, backslash, pipe and line breaks are escaped as \\\\, \\|, \\n
+and \\r, so any title survives a save and load unchanged. Such files start
+with the HEADER line. Files without it were written before escaping
+existed; they are read as they always were, so a title like C:\\new keeps
+its backslash, and upgrade_file() rewrites them in the escaped format.
+
+Loading reads the file in large chunks. A chunk without escapes in which
+every line has the same number of fields is split in one go and its columns
+converted with map(), so the work happens in C; other chunks fall back to a
+compiled regex. Big files can be parsed in parallel: the file is cut into
+line-aligned byte ranges and each range is parsed by a worker process.
+"""
+import gc
+import os
+import re
+from itertools import chain, repeat
+
+from atomic_file import atomic_write
+
+CHUNK_SIZE = 4 * 1024 * 1024  # Bytes read and parsed at a time
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024  # Smaller files are parsed in this process
+
+HEADER = "#todo escaped\n"  # First line of every file with escaped fields
+HEADER_BYTES = HEADER.encode()
+
+FIELD = r"[^|\\\n]*(?:\\.[^|\\\n]*)*"  # Any run of plain characters and escapes
+LINE = re.compile(rf"^(\d+)\|({FIELD})\|(True|False)(?:\|({FIELD}))?\r?$", re.MULTILINE)
+LEGACY_LINE = re.compile(r"^(\d+)\|([^|\n]*)\|(True|False)(?:\|([^|\n]*))?\r?$", re.MULTILINE)
+ESCAPE = re.compile(r"\\(.)")
+UNESCAPES = {"n": "\n", "r": "\r"}
+
+
+def escape(text):
+    """Escapes a field so it contains no pipes or line breaks."""
+    if "\\" in text or "|" in text or "\n" in text or "\r" in text:
+        text = text.replace("\\", "\\\\").replace("|", "\\|").replace("\n", "\\n").replace("\r", "\\r")
+    return text
+
+
+def unescape(text):
+    if "\\" not in text:
+        return text
+    return ESCAPE.sub(lambda match: UNESCAPES.get(match.group(1), match.group(1)), text)
+
+
+def format_line(task_id, title, completed, priority=None):
+    """Returns one task as a line of the file, newline included."""
+    line = f"{task_id}|{escape(title)}|{completed}"
+    if priority is not None:
+        line += f"|{escape(priority)}"
+    return line + "\n"
+
+
+def format_records(records):
+    """Returns a whole file for (id, title, completed, priority) tuples, header included."""
+    return HEADER + "".join(format_line(*record) for record in records)
+
+
+def is_escaped(path):
+    """True if the file starts with HEADER, i.e. its fields are escaped."""
+    with open(path, "rb") as file:
+        return file.read(len(HEADER_BYTES)) == HEADER_BYTES
+
+
+def parse(text, escaped=True):
+    """
+    Parses lines of the file into (id, title, completed, priority) tuples.
+    Priority is None for plain tasks. Lines that are not tasks are skipped.
+    With escaped=False the fields are taken as they are (files from before
+    escaping).
+    """
+    if "\r" in text:
+        text = text.replace("\r\n", "\n")
+    if not escaped or "\\" not in text:
+        records = parse_uniform(text)
+        if records is not None:
+            return records
+    if not escaped:
+        return [(int(task_id), title, completed == "True", priority or None)
+                for task_id, title, completed, priority in LEGACY_LINE.findall(text)]
+    records = LINE.findall(text)
+    if "\\" in text:
+        return [(int(task_id), unescape(title), completed == "True", unescape(priority) or None)
+                for task_id, title, completed, priority in records]
+    return [(int(task_id), title, completed == "True", priority or None)
+            for task_id, title, completed, priority in records]
+
+
+def parse_uniform(text):
+    """
+    Fast path for text whose lines all have three fields, or all four.
+    Returns None if the text is not like that.
+    """
+    lines = text.count("\n") + (not text.endswith("\n"))
+    pipes = text.count("|")
+    if not lines or pipes not in (2 * lines, 3 * lines):
+        return None
+    width = pipes // lines + 1
+    fields = text.rstrip("\n").replace("\n", "|").split("|")
+    try:
+        ids = list(map(int, fields[0::width]))
+    except ValueError:
+        return None  # Not every line starts with an ID
+    completed = fields[2::width]
+    if completed.count("True") + completed.count("False") != lines:
+        return None
+    priorities = [priority or None for priority in fields[3::width]] if width == 4 else repeat(None)
+    return list(zip(ids, fields[1::width], map("True".__eq__, completed), priorities))
+
+
+def iter_chunks(path, start=0, stop=None, escaped=None):
+    """
+    Yields the tasks of the whole lines between two byte offsets of a file,
+    one list per CHUNK_SIZE chunk read. escaped=None checks the file's header.
+    """
+    if stop is None:
+        stop = os.path.getsize(path)
+    if escaped is None:
+        escaped = is_escaped(path)
+    if escaped and start == 0:
+        start = len(HEADER_BYTES)
+    with open(path, "rb") as file:
+        file.seek(start)
+        rest = b""
+        while start < stop:
+            data = rest + file.read(min(CHUNK_SIZE, stop - start))
+            start += len(data) - len(rest)
+            if len(data) == len(rest):
+                break  # File is shorter than expected
+            cut = data.rfind(b"\n") + 1 if start < stop else len(data)
+            yield parse(data[:cut].decode("utf-8", errors="replace"), escaped)
+            rest = data[cut:]
+        if rest:
+            yield parse(rest.decode("utf-8", errors="replace"), escaped)
+
+
+def parse_range(path, start, stop, escaped=None):
+    """Parses the whole lines between two byte offsets of a file."""
+    records = []
+    for chunk in iter_chunks(path, start, stop, escaped):
+        records.extend(chunk)
+    return records
+
+
+def line_boundaries(path, parts):
+    """Splits a file into `parts` byte ranges that each start at a line."""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as file:
+        for part in range(1, parts):
+            file.seek(max(size * part // parts, bounds[-1]))
+            file.readline()  # Move to the start of the next line
+            bounds.append(min(file.tell(), size))
+    bounds.append(size)
+    return [(start, stop) for start, stop in zip(bounds, bounds[1:]) if start < stop]
+
+
+def read_records(path, processes=None):
+    """
+    Reads every task of a file as (id, title, completed, priority) tuples.
+
+    Files over PARALLEL_MIN_BYTES are parsed by a pool of `processes` worker
+    processes (default: one per CPU); processes=1 never starts a pool.
+    """
+    if not os.path.exists(path):
+        return []
+    size = os.path.getsize(path)
+    escaped = is_escaped(path)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    # Millions of new tuples would otherwise set off the cyclic garbage
+    # collector over and over, although none of them can form a cycle
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        if processes <= 1 or size < PARALLEL_MIN_BYTES:
+            return parse_range(path, 0, size, escaped)
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        ranges = line_boundaries(path, processes)
+        records = []
+        with ProcessPoolExecutor(processes) as pool:
+            for part in pool.map(parse_range, repeat(path), *zip(*ranges), repeat(escaped)):
+                records.extend(part)
+        return records
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def write_records(path, records):
+    """Writes (id, title, completed, priority) tuples, replacing the file atomically."""
+    atomic_write(path, format_records(records))
+
+
+def upgrade_file(path):
+    """
+    Rewrites a file from before escaping in the escaped format, one chunk at
+    a time, so new escaped lines can be appended to it.
+    """
+    if os.path.exists(path) and os.path.getsize(path) and not is_escaped(path):
+        chunks = iter_chunks(path, escaped=False)
+        atomic_write(path, chain([HEADER], ("".join(format_line(*record) for record in chunk)
+                                            for chunk in chunks)))
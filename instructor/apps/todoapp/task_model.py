@@ -0,0 +1,371 @@
+"""
+The task model shared by todo-oops-dict.py and the todo-ui-*.py frontends.
+
+ToDoList keeps its tasks in two structures:
+
+- a dict from task ID to task, so finding, editing, toggling and deleting
+  a task by ID never scans the list;
+- the tasks in display order in a list of slots, with a Fenwick tree (a
+  binary indexed tree) counting the live slots. Deleting a task only empties
+  its slot, so the order of the others never changes, and the tree turns a
+  display position into a task (and back) in O(log n). Emptied slots are
+  dropped in one pass once they outnumber the live ones.
+
+Frontends that select tasks by row use task_at(row) and index_of(task_id);
+the others use get(task_id). Iterating over the ToDoList yields the tasks
+in display order. IDs come from an IdSequence, so they stay unique after
+deletes. Sorted, filtered and paged views of a ToDoList are in
+task_views.py.
+
+Task and HighPriorityTask use __slots__, so a million tasks take about a
+third less memory than with plain classes; FrozenTask and FrozenHighPriorityTask
+are immutable copies of them. Run this file to compare the two.
+
+Every change is recorded in an UndoJournal (see undo_journal.py) as the
+call that reverts it, so undo() and redo() work without keeping copies of
+the list. A deleted task goes back into its old slot; clear_tasks() just
+sets the old structures aside, so undoing it is O(1) too.
+"""
+import itertools
+import sys
+from dataclasses import dataclass
+
+from id_sequence import IdSequence
+from undo_journal import UndoJournal
+
+COMPACT_MIN_SLOTS = 64  # Don't bother compacting very small lists
+
+# Numbers every layout of the slots, so undo can tell if a slot is still valid
+slot_generations = itertools.count()
+
+
+class Task:
+    """
+    A simple Task class.
+
+    __slots__ keeps the attributes in fixed fields instead of a __dict__ per
+    task, which makes every task much smaller (see the benchmark at the end).
+    A subclass can show tasks differently by setting DISPLAY; it must then
+    declare `__slots__ = ()` too, or its tasks get a __dict__ again.
+    """
+    __slots__ = ("id", "title", "completed")
+
+    STATUS = ("✘", "✔")  # Status glyph, indexed by completed
+    DISPLAY = "ID: {id} | [{status}] {title}"
+
+    def __init__(self, task_id, title):
+        self.id = task_id
+        self.title = title
+        self.completed = False
+
+    def toggle_completion(self):
+        """Toggle the completion status of the task."""
+        self.completed = not self.completed
+
+    def freeze(self):
+        """Returns an immutable copy of the task."""
+        return FrozenTask(self.id, self.title, self.completed)
+
+    def __str__(self):
+        return self.DISPLAY.format(id=self.id, status=self.STATUS[self.completed], title=self.title)
+
+
+class HighPriorityTask(Task):
+    """
+    A specialized Task with a priority attribute.
+    Demonstrates inheritance from the base Task class.
+    """
+    __slots__ = ("priority",)
+
+    def __init__(self, task_id, title, priority):
+        super().__init__(task_id, title)  # Initialize the parent (Task) attributes
+        # Tasks share one string per priority ("High", ...) instead of a copy each
+        self.priority = sys.intern(priority)
+
+    def freeze(self):
+        return FrozenHighPriorityTask(self.id, self.title, self.completed, self.priority)
+
+    def __str__(self):
+        """
+        Override the string representation to include priority.
+        """
+        return f"{Task.__str__(self)} (Priority: {self.priority})"
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenTask:
+    """
+    An immutable task, e.g. to keep a copy that later edits can't change.
+    Use dataclasses.replace() to get a changed copy.
+    """
+    id: int
+    title: str
+    completed: bool = False
+
+    STATUS = Task.STATUS
+    DISPLAY = Task.DISPLAY
+    __str__ = Task.__str__
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenHighPriorityTask(FrozenTask):
+    """An immutable HighPriorityTask."""
+    priority: str = ""
+
+    def __post_init__(self):
+        object.__setattr__(self, "priority", sys.intern(self.priority))
+
+    __str__ = HighPriorityTask.__str__
+
+
+class ToDoList:
+    """
+    An ordered collection of tasks, indexed by ID and by display position.
+
+    task_class and high_priority_class let a frontend use its own Task
+    classes, e.g. to display them differently. Pass a persistent
+    IdSequence as `sequence` if the tasks are saved somewhere. Changes can
+    be undone with undo() and redo(); pass an UndoJournal as `journal` to
+    change how many steps are kept.
+    """
+
+    def __init__(self, task_class=Task, high_priority_class=HighPriorityTask, sequence=None,
+                 journal=None):
+        self.task_class = task_class
+        self.high_priority_class = high_priority_class
+        self.sequence = sequence or IdSequence()
+        self.journal = UndoJournal() if journal is None else journal
+        self.generation = next(slot_generations)  # Changes whenever the slots are rebuilt
+        self.views = []      # TaskViews to keep up to date, see task_views.py
+        self.by_id = {}      # task ID -> task
+        self.slot_of = {}    # task ID -> position in self.slots
+        self.slots = []      # tasks in display order; None where one was deleted
+        self.tree = []       # Fenwick tree of live-slot counts over self.slots
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        """Yields the tasks in display order."""
+        return (task for task in self.slots if task is not None)
+
+    def __contains__(self, task_id):
+        return task_id in self.by_id
+
+    @property
+    def tasks(self):
+        """A list of the tasks in display order (a copy)."""
+        return list(self)
+
+    # --- Fenwick tree over the slots ---
+    def count_before(self, slot):
+        """Number of live tasks in slots[:slot]."""
+        total = 0
+        while slot > 0:
+            total += self.tree[slot - 1]
+            slot -= slot & -slot
+        return total
+
+    def append_slot(self, task):
+        self.slots.append(task)
+        node = len(self.slots)
+        self.tree.append(1 + self.count_before(node - 1) - self.count_before(node - (node & -node)))
+
+    def fill_slot(self, slot, task):
+        """Puts a task (or None) into an existing slot."""
+        self.slots[slot] = task
+        change = -1 if task is None else 1
+        node = slot + 1
+        while node <= len(self.tree):
+            self.tree[node - 1] += change
+            node += node & -node
+
+    def compact(self):
+        """Drops the slots of deleted tasks and rebuilds the tree."""
+        self.generation = next(slot_generations)
+        self.slots = [task for task in self.slots if task is not None]
+        self.slot_of = {task.id: slot for slot, task in enumerate(self.slots)}
+        self.tree = [1] * len(self.slots)
+        for node in range(1, len(self.tree) + 1):
+            parent = node + (node & -node)
+            if parent <= len(self.tree):
+                self.tree[parent - 1] += self.tree[node - 1]
+
+    # --- Lookups ---
+    def get(self, task_id):
+        """Returns the task with this ID, or None."""
+        return self.by_id.get(task_id)
+
+    def task_at(self, index):
+        """Returns the task shown at a display position (0-based)."""
+        if not 0 <= index < len(self.by_id):
+            raise IndexError("task index out of range")
+        node = 0
+        remaining = index + 1
+        step = 1 << (len(self.tree).bit_length() - 1)
+        while step:
+            if node + step <= len(self.tree) and self.tree[node + step - 1] < remaining:
+                node += step
+                remaining -= self.tree[node - 1]
+            step >>= 1
+        return self.slots[node]
+
+    def index_of(self, task_id):
+        """Returns the display position of a task, or None."""
+        slot = self.slot_of.get(task_id)
+        return None if slot is None else self.count_before(slot)
+
+    # --- Changes ---
+    def add_task(self, title, priority=None, task_id=None):
+        """
+        Adds a task at the end; with a priority it is a high-priority task.
+        A task_id is only given when loading saved tasks, which can't be undone.
+        """
+        if task_id is None:
+            task_id = self.sequence.allocate()
+            self.journal.record(("delete_task", task_id))
+        elif task_id in self.by_id:
+            raise ValueError(f"Duplicate task ID {task_id}")
+        else:
+            self.sequence.advance_past(task_id)
+        if priority:
+            task = self.high_priority_class(task_id, title, priority)
+        else:
+            task = self.task_class(task_id, title)
+        self.by_id[task_id] = task
+        self.slot_of[task_id] = len(self.slots)
+        self.append_slot(task)
+        self.changed(task_id)
+        return task
+
+    def add_tasks(self, titles, priority=None):
+        """Adds many tasks, reserving all their IDs at once."""
+        titles = list(titles)
+        tasks = [self.add_task(title, priority, task_id)
+                 for task_id, title in zip(self.sequence.reserve(len(titles)), titles)]
+        for task in tasks:
+            self.journal.record(("delete_task", task.id))  # Undone one task at a time
+        return tasks
+
+    def edit_task(self, task_id, new_title):
+        """Changes a task's title. Returns False if there is no such task."""
+        task = self.by_id.get(task_id)
+        if task is None:
+            return False
+        self.journal.record(("edit_task", task_id, task.title))
+        task.title = new_title
+        self.changed(task_id)
+        return True
+
+    def toggle_task(self, task_id):
+        """Toggles a task's completion. Returns False if there is no such task."""
+        task = self.by_id.get(task_id)
+        if task is None:
+            return False
+        task.toggle_completion()
+        self.journal.record(("toggle_task", task_id))
+        self.changed(task_id)
+        return True
+
+    def delete_task(self, task_id):
+        """Deletes a task. Returns False if there is no such task."""
+        task = self.by_id.pop(task_id, None)
+        if task is None:
+            return False
+        slot = self.slot_of.pop(task_id)
+        self.journal.record(("restore_task", task, slot, self.count_before(slot), self.generation))
+        self.fill_slot(slot, None)
+        self.changed(task_id)
+        dead = len(self.slots) - len(self.by_id)
+        if dead > len(self.by_id) and len(self.slots) >= COMPACT_MIN_SLOTS:
+            self.compact()
+        return True
+
+    def restore_task(self, task, slot, index, generation):
+        """
+        Puts a deleted task back where it was: into its old slot, or if the
+        slots were rebuilt since, at its old display position (O(n)).
+        """
+        if generation == self.generation:
+            self.fill_slot(slot, task)
+        else:
+            live = list(self)
+            live.insert(index, task)
+            self.slots = live
+            self.compact()
+            slot = self.slot_of[task.id]
+        self.by_id[task.id] = task
+        self.slot_of[task.id] = slot
+        self.journal.record(("delete_task", task.id))
+        self.changed(task.id)
+
+    def clear_tasks(self):
+        """Deletes every task. IDs keep counting up."""
+        # The old structures are kept as they are for undo, not copied
+        self.journal.record(("restore_tasks", self.by_id, self.slot_of, self.slots, self.tree,
+                             self.generation))
+        self.generation = next(slot_generations)
+        self.by_id = {}
+        self.slot_of = {}
+        self.slots = []
+        self.tree = []
+        for view in self.views:
+            view.rebuild()
+
+    def restore_tasks(self, by_id, slot_of, slots, tree, generation):
+        """Undoes clear_tasks()."""
+        self.journal.record(("clear_tasks",))
+        self.by_id, self.slot_of, self.slots, self.tree = by_id, slot_of, slots, tree
+        self.generation = generation
+        for view in self.views:
+            view.rebuild()
+
+    def changed(self, task_id):
+        """Tells the views that a task was added, changed or removed."""
+        for view in self.views:
+            view.refresh(task_id)
+
+    # --- Undo ---
+    def undo(self):
+        """Reverts the last change. Returns False if there is nothing to undo."""
+        return self.journal.undo(self)
+
+    def redo(self):
+        """Makes the last undone change again. Returns False if there is none."""
+        return self.journal.redo(self)
+
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    class DictTask:
+        """The Task class as it was before __slots__."""
+        def __init__(self, task_id, title):
+            self.id = task_id
+            self.title = title
+            self.completed = False
+
+    class DictHighPriorityTask(DictTask):
+        def __init__(self, task_id, title, priority):
+            super().__init__(task_id, title)
+            self.priority = priority
+
+    def measure(name, task_class, high_priority_class):
+        # Every 10th task is high priority, with its own copy of the priority
+        # string as it would come from input() or a file
+        count = 1_000_000
+        titles = [f"Task number {i}" for i in range(count)]
+        tracemalloc.start()
+        start = time.perf_counter()
+        tasks = [high_priority_class(i, title, "".join(("Hi", "gh"))) if i % 10 == 0 else task_class(i, title)
+                 for i, title in enumerate(titles)]
+        elapsed = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{name:<18} {size / count:6.1f} bytes/task  {count / elapsed / 1e6:5.2f}M tasks/s")
+        return tasks
+
+    measure("__dict__ classes", DictTask, DictHighPriorityTask)
+    measure("__slots__ classes", Task, HighPriorityTask)
+    measure("frozen dataclasses", FrozenTask, FrozenHighPriorityTask)
@@ -0,0 +1,289 @@
+"""
+A column-oriented, array-backed store for large numbers of tasks.
+
+Instead of one Python object per task, TaskTable keeps every field in its
+own compact column:
+
+- ids:        array("I")  - 4 bytes per task, kept sorted for binary search
+- status:     bytearray   - 1 byte per task (pending / completed / deleted)
+- priorities: bytearray   - 1 byte code per task, decoded through a small table
+- titles:     one UTF-8 bytearray, addressed by per-task start/length columns
+
+That is about 30 bytes per task instead of several hundred. Counting and
+filtering run over whole columns with C-level bytes methods. TaskRow gives
+a row the same interface as Task/HighPriorityTask (id, title, completed,
+priority, toggle_completion, __str__), so existing display code keeps working.
+todo-file-simple.py keeps its tasks in a TaskTable.
+"""
+import re
+from array import array
+from bisect import bisect_left
+
+PENDING = 0
+COMPLETED = 1
+DELETED = 2
+NO_PRIORITY = 0  # Priority code of a plain Task
+
+
+class TaskRow:
+    """
+    A lightweight Task-like handle onto one row of a TaskTable. compact()
+    moves rows, so a handle finds its row again by task ID afterwards.
+    """
+    __slots__ = ("table", "id", "cached_row", "layout")
+
+    def __init__(self, table, row):
+        self.table = table
+        self.id = table.ids[row]
+        self.cached_row = row
+        self.layout = table.layout
+
+    @property
+    def row(self):
+        if self.layout != self.table.layout:
+            row = self.table.row_of(self.id)
+            if row is None:
+                raise KeyError(f"Task {self.id} was deleted")
+            self.cached_row, self.layout = row, self.table.layout
+        return self.cached_row
+
+    @property
+    def title(self):
+        return self.table.title_at(self.row)
+
+    @title.setter
+    def title(self, value):
+        self.table.set_title(self.row, value)
+
+    @property
+    def completed(self):
+        return self.table.status[self.row] == COMPLETED
+
+    @completed.setter
+    def completed(self, value):
+        self.table.status[self.row] = COMPLETED if value else PENDING
+
+    @property
+    def priority(self):
+        code = self.table.priorities[self.row]
+        if code == NO_PRIORITY:
+            raise AttributeError("priority")  # Behave like a plain Task for getattr()
+        return self.table.priority_names[code]
+
+    def toggle_completion(self):
+        """Toggle the completion status of the task."""
+        self.completed = not self.completed
+
+    def __str__(self):
+        status = "✔" if self.completed else "✘"
+        text = f"ID: {self.id} | [{status}] {self.title}"
+        code = self.table.priorities[self.row]
+        if code != NO_PRIORITY:
+            text += f" (Priority: {self.table.priority_names[code]})"
+        return text
+
+
+class TaskTable:
+    """Columnar storage for tasks, addressed by task ID."""
+
+    def __init__(self):
+        self.ids = array("I")
+        self.status = bytearray()
+        self.priorities = bytearray()
+        self.title_starts = array("Q")
+        self.title_lengths = array("I")
+        self.titles = bytearray()
+        self.priority_names = [""]          # code -> priority text
+        self.priority_codes = {"": NO_PRIORITY}
+        self.deleted = 0
+        self.garbage = 0                    # Title bytes no longer referenced
+        self.layout = 0                     # Bumped by compact(), which moves rows
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        """Builds a table from Task/HighPriorityTask objects."""
+        table = cls()
+        for task in sorted(tasks, key=lambda task: task.id):
+            table.append(task.id, task.title, task.completed, getattr(task, "priority", None))
+        return table
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Builds a table from (id, title, completed, priority) tuples, sorting
+        them by ID first if they are out of order. Repeated IDs keep the first.
+        """
+        if any(records[i][0] >= records[i + 1][0] for i in range(len(records) - 1)):
+            records = sorted(records, key=lambda record: record[0])
+        table = cls()
+        for task_id, title, completed, priority in records:
+            if not table.ids or task_id > table.ids[-1]:
+                table.append(task_id, title, completed, priority)
+        return table
+
+    def __len__(self):
+        return len(self.ids) - self.deleted
+
+    def __iter__(self):
+        """Yields a view of every live task, in ID order."""
+        for row in range(len(self.ids)):
+            if self.status[row] != DELETED:
+                yield TaskRow(self, row)
+
+    def priority_code(self, priority):
+        if not priority:
+            return NO_PRIORITY
+        code = self.priority_codes.get(priority)
+        if code is None:
+            code = len(self.priority_names)
+            if code > 255:
+                raise ValueError("TaskTable supports at most 255 distinct priorities")
+            self.priority_names.append(priority)
+            self.priority_codes[priority] = code
+        return code
+
+    def append(self, task_id, title, completed=False, priority=None):
+        """Adds a task. IDs must be appended in increasing order."""
+        if self.ids and task_id <= self.ids[-1]:
+            raise ValueError(f"Task ID {task_id} is not greater than the last ID {self.ids[-1]}")
+        encoded = title.encode()
+        self.ids.append(task_id)
+        self.status.append(COMPLETED if completed else PENDING)
+        self.priorities.append(self.priority_code(priority))
+        self.title_starts.append(len(self.titles))
+        self.title_lengths.append(len(encoded))
+        self.titles += encoded
+        return TaskRow(self, len(self.ids) - 1)
+
+    def row_of(self, task_id):
+        """Returns the row of a live task, or None."""
+        row = bisect_left(self.ids, task_id)
+        if row < len(self.ids) and self.ids[row] == task_id and self.status[row] != DELETED:
+            return row
+        return None
+
+    def get(self, task_id):
+        """Returns a view of a task by ID, or None if there is no such task."""
+        row = self.row_of(task_id)
+        return None if row is None else TaskRow(self, row)
+
+    def title_at(self, row):
+        start = self.title_starts[row]
+        return self.titles[start:start + self.title_lengths[row]].decode()
+
+    def set_title(self, row, title):
+        """Replaces a title. Short enough titles are rewritten in place, longer ones appended."""
+        encoded = title.encode()
+        length = self.title_lengths[row]
+        if len(encoded) <= length:
+            start = self.title_starts[row]
+            self.titles[start:start + len(encoded)] = encoded
+            self.garbage += length - len(encoded)
+        else:
+            self.title_starts[row] = len(self.titles)
+            self.titles += encoded
+            self.garbage += length
+        self.title_lengths[row] = len(encoded)
+
+    def delete(self, task_id):
+        """Marks a task deleted. Returns False if it did not exist."""
+        row = self.row_of(task_id)
+        if row is None:
+            return False
+        self.status[row] = DELETED
+        self.garbage += self.title_lengths[row]
+        self.deleted += 1
+        return True
+
+    def status_rows(self, value):
+        """Yields the rows whose status byte equals value, scanning in C."""
+        for match in re.finditer(re.escape(bytes([value])), self.status):
+            yield match.start()
+
+    def rows(self, completed=None, priority=None):
+        """Yields the rows of the live tasks matching every given condition."""
+        if priority is not None:
+            code = self.priority_codes.get(priority)
+            if code is None:
+                return
+            for match in re.finditer(re.escape(bytes([code])), self.priorities):
+                status = self.status[match.start()]
+                if status != DELETED and (completed is None or (status == COMPLETED) == completed):
+                    yield match.start()
+        elif completed is None:
+            for row in range(len(self.ids)):
+                if self.status[row] != DELETED:
+                    yield row
+        else:
+            yield from self.status_rows(COMPLETED if completed else PENDING)
+
+    def where(self, completed=None, priority=None):
+        """Returns views of the tasks matching the given status and/or priority."""
+        return [TaskRow(self, row) for row in self.rows(completed, priority)]
+
+    def count(self, completed=None, priority=None):
+        """Counts matching tasks; plain status counts never leave C code."""
+        if priority is None:
+            if completed is None:
+                return len(self)
+            return self.status.count(COMPLETED if completed else PENDING)
+        return sum(1 for _ in self.rows(completed, priority))
+
+    def compact(self):
+        """Drops deleted rows and unreferenced title bytes."""
+        live = [row for row in range(len(self.ids)) if self.status[row] != DELETED]
+        titles = bytearray()
+        starts = array("Q")
+        for row in live:
+            start = self.title_starts[row]
+            starts.append(len(titles))
+            titles += self.titles[start:start + self.title_lengths[row]]
+        self.ids = array("I", (self.ids[row] for row in live))
+        self.status = bytearray(self.status[row] for row in live)
+        self.priorities = bytearray(self.priorities[row] for row in live)
+        self.title_lengths = array("I", (self.title_lengths[row] for row in live))
+        self.title_starts = starts
+        self.titles = titles
+        self.deleted = 0
+        self.garbage = 0
+        self.layout += 1
+
+    def memory_usage(self):
+        """Approximate bytes held by the columns."""
+        return (self.ids.itemsize * len(self.ids) + len(self.status) + len(self.priorities)
+                + self.title_starts.itemsize * len(self.title_starts)
+                + self.title_lengths.itemsize * len(self.title_lengths) + len(self.titles))
+
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    class Task:
+        def __init__(self, task_id, title):
+            self.id = task_id
+            self.title = title
+            self.completed = False
+
+    count = 1_000_000
+    tracemalloc.start()
+    tasks = [Task(i, f"Task number {i}") for i in range(1, count + 1)]
+    objects_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    table = TaskTable()
+    for task in tasks:
+        table.append(task.id, task.title, task.id % 3 == 0, "High" if task.id % 10 == 0 else None)
+    table_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"Task objects: {objects_size / count:6.1f} bytes/task")
+    print(f"TaskTable:    {table_size / count:6.1f} bytes/task")
+    start = time.perf_counter()
+    done = table.count(completed=True)
+    print(f"count(completed=True) = {done} in {(time.perf_counter() - start) * 1000:.2f} ms")
+    start = time.perf_counter()
+    urgent = table.where(completed=False, priority="High")
+    print(f"where(completed=False, priority='High') = {len(urgent)} in "
+          f"{(time.perf_counter() - start) * 1000:.2f} ms")
@@ -0,0 +1,116 @@
+"""
+Sorted and filtered views of a ToDoList, kept up to date as it changes.
+
+A TaskView keeps the sort keys of the tasks it shows in a sorted list. The
+ToDoList tells its views about every task it adds, changes or removes, and
+each view moves just that task with bisect instead of sorting everything
+again: O(log n) comparisons per change (plus a memmove of the list).
+
+page(n, size) slices out one screen of tasks in O(size), so a frontend
+showing 100k tasks one screen at a time only touches the visible rows.
+
+    view = TaskView(todo, sort="priority", where=lambda task: not task.completed)
+    for task in view.page(0, 20):
+        print(task)
+"""
+from bisect import bisect_left, insort
+
+PRIORITY_RANK = {"high": 0, "medium": 1, "low": 2}  # Other priorities sort after these
+
+
+def priority_key(task):
+    """High, Medium, Low, any other priority, then tasks without one."""
+    priority = getattr(task, "priority", None)
+    if not priority:
+        return (len(PRIORITY_RANK) + 1, "")
+    return (PRIORITY_RANK.get(priority.lower(), len(PRIORITY_RANK)), priority.lower())
+
+
+SORT_KEYS = {
+    "added": lambda task: (),  # IDs only go up, so this is the order they were added in
+    "priority": priority_key,
+    "status": lambda task: (task.completed,),  # Open tasks first
+    "title": lambda task: (task.title.casefold(),),
+}
+
+FILTERS = {
+    "all": None,
+    "open": lambda task: not task.completed,
+    "done": lambda task: task.completed,
+}
+
+
+def next_name(names, current):
+    """The name after `current` in a dict of choices, wrapping around."""
+    names = list(names)
+    return names[(names.index(current) + 1) % len(names)]
+
+
+class TaskView:
+    """
+    The tasks of a ToDoList for which where(task) is true, sorted by one of
+    SORT_KEYS (ties are broken by task ID). Call close() when the view is no
+    longer needed, so the list stops updating it.
+    """
+
+    def __init__(self, todo_list, sort="added", where=None):
+        self.todo_list = todo_list
+        self.sort = sort
+        self.sort_key = SORT_KEYS[sort]
+        self.where = where
+        self.keys = []    # (sort key..., task ID) of every task shown, sorted
+        self.key_of = {}  # task ID -> its entry in self.keys
+        self.rebuild()
+        todo_list.views.append(self)
+
+    def close(self):
+        self.todo_list.views.remove(self)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return (self.todo_list.get(key[-1]) for key in self.keys)
+
+    def key(self, task):
+        return self.sort_key(task) + (task.id,)
+
+    def rebuild(self):
+        """Sorts all tasks again (after the whole list changed)."""
+        self.key_of = {task.id: self.key(task) for task in self.todo_list
+                       if self.where is None or self.where(task)}
+        self.keys = sorted(self.key_of.values())
+
+    def refresh(self, task_id):
+        """Moves one task to its place after it was added, changed or removed."""
+        task = self.todo_list.get(task_id)
+        if task is not None and (self.where is None or self.where(task)):
+            key = self.key(task)
+        else:
+            key = None
+        old_key = self.key_of.get(task_id)
+        if key == old_key:
+            return
+        if old_key is not None:
+            del self.keys[bisect_left(self.keys, old_key)]
+            del self.key_of[task_id]
+        if key is not None:
+            insort(self.keys, key)
+            self.key_of[task_id] = key
+
+    # --- Reading the view ---
+    def task_at(self, index):
+        """Returns the task at a position in the view (0-based)."""
+        return self.todo_list.get(self.keys[index][-1])
+
+    def index_of(self, task_id):
+        """Returns the position of a task in the view, or None if it isn't shown."""
+        key = self.key_of.get(task_id)
+        return None if key is None else bisect_left(self.keys, key)
+
+    def page(self, n, size):
+        """Returns the tasks on page n (0-based) when showing `size` tasks per page."""
+        return [self.todo_list.get(key[-1]) for key in self.keys[n * size:(n + 1) * size]]
+
+    def page_count(self, size):
+        return max(1, -(-len(self.keys) // size))
@@ -0,0 +1,182 @@
+"""
+An inverted index over task titles, shared by the file-backed todo apps.
+
+Titles are split into lowercase word tokens. Each token has a posting set
+of task IDs. A sorted vocabulary answers prefix queries with bisect, and a
+trigram -> tokens map finds misspelled or partial words. The index is
+updated one task at a time and saved next to the data file, stamped with
+the data file's size and mtime so a stale copy is rebuilt instead of trusted.
+"""
+import heapq
+import json
+import math
+import os
+import re
+from bisect import bisect_left, insort
+
+TOKEN = re.compile(r"\w+")
+PREFIX_EXPANSION_LIMIT = 50  # Most vocabulary tokens a prefix term expands to
+TRIGRAM_MIN_SIMILARITY = 0.4
+EXACT_WEIGHT = 1.0
+PREFIX_WEIGHT = 0.7
+TRIGRAM_WEIGHT = 0.5
+INDEX_VERSION = 1
+
+
+def tokenize(text):
+    return [token.lower() for token in TOKEN.findall(text)]
+
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def index_path(data_path):
+    """Returns where the title index of a data file is stored."""
+    return data_path + ".search"
+
+
+class TitleIndex:
+    """Token, prefix and trigram lookups from title words to task IDs."""
+
+    def __init__(self):
+        self.postings = {}      # token -> set of task IDs
+        self.docs = {}          # task ID -> tuple of distinct tokens
+        self.vocabulary = []    # sorted tokens, for prefix search
+        self.trigram_map = {}   # trigram -> set of tokens
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add_token(self, token, task_id, keep_sorted=True):
+        ids = self.postings.get(token)
+        if ids is None:
+            ids = self.postings[token] = set()
+            if keep_sorted:
+                insort(self.vocabulary, token)
+            else:
+                self.vocabulary.append(token)  # Caller sorts once at the end
+            for gram in trigrams(token):
+                self.trigram_map.setdefault(gram, set()).add(token)
+        ids.add(task_id)
+
+    def remove_token(self, token, task_id):
+        ids = self.postings[token]
+        ids.discard(task_id)
+        if not ids:
+            del self.postings[token]
+            del self.vocabulary[bisect_left(self.vocabulary, token)]
+            for gram in trigrams(token):
+                tokens = self.trigram_map[gram]
+                tokens.discard(token)
+                if not tokens:
+                    del self.trigram_map[gram]
+
+    def add(self, task_id, title, keep_sorted=True):
+        """Indexes a task's title, replacing whatever was indexed for it before."""
+        tokens = tuple(dict.fromkeys(tokenize(title)))
+        old = self.docs.get(task_id, ())
+        if old == tokens:
+            return
+        for token in old:
+            if token not in tokens:
+                self.remove_token(token, task_id)
+        for token in tokens:
+            self.add_token(token, task_id, keep_sorted)
+        self.docs[task_id] = tokens
+
+    def remove(self, task_id):
+        """Drops a task from the index."""
+        for token in self.docs.pop(task_id, ()):
+            self.remove_token(token, task_id)
+
+    def rebuild(self, items):
+        """Re-indexes from scratch from (task ID, title) pairs."""
+        self.__init__()
+        for task_id, title in items:
+            self.add(task_id, title, keep_sorted=False)
+        self.vocabulary.sort()
+
+    def prefix_tokens(self, prefix):
+        start = bisect_left(self.vocabulary, prefix)
+        for token in self.vocabulary[start:start + PREFIX_EXPANSION_LIMIT]:
+            if not token.startswith(prefix):
+                break
+            yield token
+
+    def similar_tokens(self, term):
+        """Yields (token, similarity) for tokens sharing enough trigrams with the term."""
+        grams = trigrams(term)
+        shared = {}
+        for gram in grams:
+            for token in self.trigram_map.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+        for token, count in shared.items():
+            similarity = count / max(len(grams), len(trigrams(token)))
+            if similarity >= TRIGRAM_MIN_SIMILARITY:
+                yield token, similarity
+
+    def search(self, query, limit=10):
+        """
+        Returns up to `limit` task IDs ranked by relevance. Whole-word matches
+        score highest, then words starting with a query term, then words that
+        merely look alike. Rare words count for more than common ones.
+        """
+        total = len(self.docs)
+        scores = {}
+        for term in dict.fromkeys(tokenize(query)):
+            matches = {}
+            if term in self.postings:
+                matches[term] = EXACT_WEIGHT
+            for token in self.prefix_tokens(term):
+                matches.setdefault(token, PREFIX_WEIGHT)
+            if not matches:
+                for token, similarity in self.similar_tokens(term):
+                    matches[token] = TRIGRAM_WEIGHT * similarity
+
+            for token, weight in matches.items():
+                ids = self.postings[token]
+                score = weight * math.log(1 + total / len(ids))
+                for task_id in ids:
+                    scores[task_id] = scores.get(task_id, 0.0) + score
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [task_id for task_id, score in best]
+
+    def load(self, path, data_path):
+        """Reads a saved index. Returns False if it is missing or stale."""
+        if not os.path.exists(path) or not os.path.exists(data_path):
+            return False
+        stat = os.stat(data_path)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                saved = json.load(file)
+        except ValueError:
+            return False
+        if saved.get("version") != INDEX_VERSION or saved.get("stamp") != [stat.st_size, stat.st_mtime_ns]:
+            return False
+
+        self.__init__()
+        docs = {}
+        for token, ids in saved["postings"].items():
+            for task_id in ids:
+                docs.setdefault(task_id, []).append(token)
+            self.add_token(token, ids[0], keep_sorted=False)
+            self.postings[token].update(ids)
+        self.vocabulary.sort()
+        self.docs = {task_id: tuple(tokens) for task_id, tokens in docs.items()}
+        return True
+
+    def save(self, path, data_path):
+        """Writes the index, stamped with the data file it describes."""
+        if not os.path.exists(data_path):
+            return
+        stat = os.stat(data_path)
+        saved = {
+            "version": INDEX_VERSION,
+            "stamp": [stat.st_size, stat.st_mtime_ns],
+            "postings": {token: sorted(ids) for token, ids in self.postings.items()},
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(saved, file, separators=(",", ":"))
@@ -1,177 +1,1003 @@
 import struct
 import os
+import sys
+import mmap
+import re
+import shutil
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+
+from id_sequence import IdSequence, sequence_path
+from task_model import HighPriorityTask, Task
+from title_index import TitleIndex, index_path
 
 TASKS_FILE = "todos.dat"
-NORMAL_TASK_SIZE = 55  # 4 bytes ID + 50 bytes title + 1 byte completed
-HIGH_PRIORITY_TASK_SIZE = 65  # 55 bytes + 10 bytes priority
+INDEX_FILE = TASKS_FILE + ".idx"  # Sidecar slot directory: one entry per record slot
+WAL_FILE = TASKS_FILE + ".wal"  # Write-ahead log, replayed on start-up
+SECONDARY_INDEX_FILE = TASKS_FILE + ".sidx"  # Completed bitmap + priority posting lists
 
+# Durability levels:
+#   "none"  - write the data file directly; fastest, a crash can tear a record
+#   "group" - log every write, fsync the log at most every GROUP_COMMIT_MS;
+#             a crash loses at most the last GROUP_COMMIT_MS of changes
+#   "fsync" - log every write and fsync the log before the operation returns
+DURABILITY_LEVELS = ("none", "group", "fsync")
+DURABILITY = "group"
+GROUP_COMMIT_MS = 50
+WAL_CHECKPOINT_SIZE = 4 * 1024 * 1024  # Fold the log into the data file past this size
 
-class Task:
-    """A simple Task class."""
-    def __init__(self, task_id, title):
-        self.id = task_id
-        self.title = title
-        self.completed = False
+# Data file layout (version 1):
+#   header:  magic(4) + version(2) + reserved(2)
+#   records: type tag(1) + status(1) + payload length(2) + payload
+#     Task payload:             ID(4) + title(50)
+#     HighPriorityTask payload: ID(4) + title(50) + priority(10)
+FILE_MAGIC = b"TODO"
+FORMAT_VERSION = 1
+FILE_HEADER = "<4sHH"
+FILE_HEADER_SIZE = struct.calcsize(FILE_HEADER)
+RECORD_HEADER = "<BBH"
+RECORD_HEADER_SIZE = struct.calcsize(RECORD_HEADER)
+TASK_PAYLOAD = "<I50s"
+HIGH_PRIORITY_PAYLOAD = "<I50s10s"
+NORMAL_TASK_SIZE = RECORD_HEADER_SIZE + struct.calcsize(TASK_PAYLOAD)  # 58 bytes
+HIGH_PRIORITY_TASK_SIZE = RECORD_HEADER_SIZE + struct.calcsize(HIGH_PRIORITY_PAYLOAD)  # 68 bytes
 
-    def toggle_completion(self):
-        """Toggle the completion status of the task."""
-        self.completed = not self.completed
+TAG_TASK = 1
+TAG_HIGH_PRIORITY = 2
+COMPLETED = 0x01  # Status bits
+TOMBSTONE = 0x02  # A deleted record whose slot can be reused
+STATUS_OFFSET = 1  # Position of the status byte inside a record
 
-    def __str__(self):
-        status = "✔" if self.completed else "✘"
-        return f"ID: {self.id} | [{status}] {self.title}"
+COMPACT_RATIO = 0.5  # Compact automatically once half of the records are dead
+COMPACT_MIN_RECORDS = 64  # ...but never bother for tiny files
 
+# Slot directory layout:
+#   header:  magic, data file size, data file mtime (ns), slot count
+#   entries: one fixed-width entry per record slot, in file order:
+#            byte offset(8) + task ID(4) + record size(2) + live flag(1) + padding(1)
+# Entry i lives at DIRECTORY_HEADER_SIZE + i * DIRECTORY_ENTRY_SIZE.
+DIRECTORY_MAGIC = b"TDIR"
+DIRECTORY_HEADER = "<4sQQI4x"
+DIRECTORY_HEADER_SIZE = struct.calcsize(DIRECTORY_HEADER)
+DIRECTORY_ENTRY = "<QIHBx"
+DIRECTORY_ENTRY_SIZE = struct.calcsize(DIRECTORY_ENTRY)
 
-class HighPriorityTask(Task):
-    """A specialized Task with priority."""
-    def __init__(self, task_id, title, priority):
-        super().__init__(task_id, title)
-        self.priority = priority
+# Legacy (version 0) layout: bare "I50s?" / "I50s?10s" records, no header or tags
+LEGACY_TASK_SIZE = 55
+LEGACY_HIGH_PRIORITY_TASK_SIZE = 65
+LEGACY_STATUS_OFFSET = 54
 
-    def __str__(self):
-        status = "✔" if self.completed else "✘"
-        return f"ID: {self.id} | [{status}] {self.title} (Priority: {self.priority})"
+# Precompiled codecs, so format strings are parsed once rather than per record
+RECORD_HEADER_STRUCT = struct.Struct(RECORD_HEADER)
+TASK_RECORD_STRUCT = struct.Struct(RECORD_HEADER + TASK_PAYLOAD[1:])
+HIGH_PRIORITY_RECORD_STRUCT = struct.Struct(RECORD_HEADER + HIGH_PRIORITY_PAYLOAD[1:])
+TASK_PAYLOAD_LENGTH = struct.calcsize(TASK_PAYLOAD)
+HIGH_PRIORITY_PAYLOAD_LENGTH = struct.calcsize(HIGH_PRIORITY_PAYLOAD)
+TASK_ID_STRUCT = struct.Struct("<I")
+DIRECTORY_HEADER_STRUCT = struct.Struct(DIRECTORY_HEADER)
+DIRECTORY_ENTRY_STRUCT = struct.Struct(DIRECTORY_ENTRY)
 
+# Secondary index layout:
+#   header: magic, data file size, data file mtime (ns), bitmap length, priority count
+#   live bitmap, completed bitmap (bit i = task ID i)
+#   per priority: name length(2) + ID count(4) + UTF-8 name + sorted uint32 IDs
+SECONDARY_INDEX_MAGIC = b"TSIX"
+SECONDARY_INDEX_HEADER_STRUCT = struct.Struct("<4sQQII")
+POSTING_HEADER_STRUCT = struct.Struct("<HI")
+NONZERO_BYTE = re.compile(rb"[^\x00]")
+BITS_IN_BYTE = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
 
-class ToDoList:
-    """A class to manage and store tasks in a binary file with random access."""
+# Write-ahead log entry: CRC32 of (offset + data), data length, data file offset, data
+WAL_ENTRY_STRUCT = struct.Struct("<IIQ")
+WAL_OFFSET_STRUCT = struct.Struct("<Q")
+
+
+def encode_text(text, size):
+    """Encodes text as UTF-8, truncated to at most `size` bytes on a character boundary."""
+    data = text.encode()
+    if len(data) > size:
+        data = data[:size].decode(errors="ignore").encode()
+    return data
+
+
+def decode_text(data):
+    """Decodes a padded fixed-width text field."""
+    return data.rstrip(b" \0").decode(errors="replace")
+
+
+def pack_task_into(buffer, offset, task):
+    """Packs a task as a tagged, length-prefixed record into a writable buffer."""
+    status = COMPLETED if task.completed else 0
+    if isinstance(task, HighPriorityTask):
+        HIGH_PRIORITY_RECORD_STRUCT.pack_into(buffer, offset, TAG_HIGH_PRIORITY, status,
+                                              HIGH_PRIORITY_PAYLOAD_LENGTH, task.id,
+                                              encode_text(task.title, 50),
+                                              encode_text(task.priority, 10))
+    else:
+        TASK_RECORD_STRUCT.pack_into(buffer, offset, TAG_TASK, status, TASK_PAYLOAD_LENGTH,
+                                     task.id, encode_text(task.title, 50))
+
+
+def pack_records(tasks):
+    """Packs tasks back to back into one preallocated buffer."""
+    buffer = bytearray(sum(ToDoList.record_size(task) for task in tasks))
+    offset = 0
+    for task in tasks:
+        pack_task_into(buffer, offset, task)
+        offset += ToDoList.record_size(task)
+    return buffer
+
+
+def pack_task(task):
+    """Packs a task into a tagged, length-prefixed record."""
+    status = COMPLETED if task.completed else 0
+    if isinstance(task, HighPriorityTask):
+        return HIGH_PRIORITY_RECORD_STRUCT.pack(TAG_HIGH_PRIORITY, status, HIGH_PRIORITY_PAYLOAD_LENGTH,
+                                                task.id, encode_text(task.title, 50),
+                                                encode_text(task.priority, 10))
+    return TASK_RECORD_STRUCT.pack(TAG_TASK, status, TASK_PAYLOAD_LENGTH,
+                                   task.id, encode_text(task.title, 50))
+
+
+def unpack_task(data):
+    """Builds a Task or HighPriorityTask from one record."""
+    tag, status = data[0], data[1]
+    if tag == TAG_HIGH_PRIORITY:
+        _, _, _, task_id, title, priority = HIGH_PRIORITY_RECORD_STRUCT.unpack_from(data)
+        task = HighPriorityTask(task_id, decode_text(title), decode_text(priority))
+    elif tag == TAG_TASK:
+        _, _, _, task_id, title = TASK_RECORD_STRUCT.unpack_from(data)
+        task = Task(task_id, decode_text(title))
+    else:
+        raise ValueError(f"Unknown record type tag {tag}")
+    task.completed = bool(status & COMPLETED)
+    return task
+
+
+def wal_entry(offset, data):
+    """Encodes one checksummed write-ahead log entry."""
+    crc = zlib.crc32(data, zlib.crc32(WAL_OFFSET_STRUCT.pack(offset)))
+    return WAL_ENTRY_STRUCT.pack(crc, len(data), offset) + data
+
+
+def read_wal(data):
+    """Yields (offset, data) for each intact log entry, stopping at the first torn one."""
+    pos = 0
+    while pos + WAL_ENTRY_STRUCT.size <= len(data):
+        crc, length, offset = WAL_ENTRY_STRUCT.unpack_from(data, pos)
+        start = pos + WAL_ENTRY_STRUCT.size
+        payload = data[start:start + length]
+        if len(payload) != length or zlib.crc32(payload, zlib.crc32(WAL_OFFSET_STRUCT.pack(offset))) != crc:
+            return
+        yield offset, payload
+        pos = start + length
+
+
+def write_all_append(fd, data):
+    """Writes a whole buffer to a descriptor opened with O_APPEND."""
+    data = memoryview(data)
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def write_all(fd, data, offset):
+    """Writes a whole buffer at a byte offset, with pwrite where the OS has it."""
+    data = memoryview(data)
+    while data:
+        if hasattr(os, "pwrite"):
+            written = os.pwrite(fd, data, offset)
+        else:
+            os.lseek(fd, offset, os.SEEK_SET)
+            written = os.write(fd, data)
+        data = data[written:]
+        offset += written
+
+
+def file_header():
+    return struct.pack(FILE_HEADER, FILE_MAGIC, FORMAT_VERSION, 0)
+
+
+def is_legacy_file(path):
+    """Returns True if the file is a headerless version 0 task file."""
+    with open(path, "rb") as file:
+        header = file.read(FILE_HEADER_SIZE)
+    return bool(header) and header[:4] != FILE_MAGIC
+
+
+def read_legacy_tasks(file, chunk_size=1 << 16):
+    """
+    Yields tasks from a version 0 file. Records there carry no size, so a
+    65-byte HighPriorityTask is recognised by its 10-byte priority field:
+    text is printable, while the next record would start with a task ID
+    whose high byte is zero.
+    """
+    buffer = b""
+    eof = False
+    while True:
+        if not eof:
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+        pos = 0
+        while len(buffer) - pos >= (LEGACY_TASK_SIZE if eof else LEGACY_HIGH_PRIORITY_TASK_SIZE):
+            priority = buffer[pos + LEGACY_TASK_SIZE:pos + LEGACY_HIGH_PRIORITY_TASK_SIZE]
+            if len(priority) == 10 and all(byte >= 0x20 and byte != 0x7F for byte in priority):
+                size = LEGACY_HIGH_PRIORITY_TASK_SIZE
+            else:
+                size = LEGACY_TASK_SIZE
+            record = buffer[pos:pos + size]
+            pos += size
+
+            if record[LEGACY_STATUS_OFFSET] == TOMBSTONE:
+                continue  # Deleted
+            task_id, title, completed = struct.unpack_from("I50s?", record)
+            if size == LEGACY_HIGH_PRIORITY_TASK_SIZE:
+                task = HighPriorityTask(task_id, decode_text(title), decode_text(priority))
+            else:
+                task = Task(task_id, decode_text(title))
+            task.completed = completed
+            yield task
+        buffer = buffer[pos:]
+        if eof:
+            if buffer:
+                print(f"Warning: {len(buffer)} trailing bytes could not be migrated.")
+            return
+
+
+def migrate_legacy_file(path=TASKS_FILE):
+    """
+    Converts a version 0 task file to the current format. The original
+    is kept next to it as <path>.v0.bak. Returns the number of tasks migrated.
+    """
+    temp_file = path + ".tmp"
+    count = 0
+    with open(path, "rb") as src, open(temp_file, "wb") as dst:
+        dst.write(file_header())
+        for task in read_legacy_tasks(src):
+            dst.write(pack_task(task))
+            count += 1
+        dst.flush()
+        os.fsync(dst.fileno())
+    os.replace(path, path + ".v0.bak")
+    os.replace(temp_file, path)
+    if os.path.exists(path + ".idx"):
+        os.remove(path + ".idx")  # Offsets are no longer valid
+    return count
+
+
+class TaskFileView:
+    """
+    A read-only, memory-mapped view of the live records in a task file.
+
+    Opening the view only maps the file; records are decoded into Task
+    objects when they are accessed. Iterating streams over the mapping in
+    constant memory, while len(), indexing and slicing use an array of
+    record offsets that is read from the slot directory (or built by one
+    header scan) the first time it is needed. Slices share the mapping
+    and the offset array instead of copying them.
+    """
+
+    def __init__(self, path=TASKS_FILE):
+        self.path = path
+        self.file = open(path, "rb")
+        self.map = None
+        self.data = memoryview(b"")
+        self.offsets = None
+        self.parent = None
+        self.records_end = None  # Where the last whole record ends, set by scan()
+
+        if os.fstat(self.file.fileno()).st_size > FILE_HEADER_SIZE:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.data = memoryview(self.map)
+        if len(self.data) and bytes(self.data[:4]) != FILE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} task file")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Releases the mapping. Slices only drop their reference to it."""
+        if self.parent is not None:
+            self.parent = None
+            return
+        self.data.release()
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def scan(self):
+        """
+        Yields (offset, size, tag, status) for every record slot in file order.
+        Stops at a torn or corrupt record; records_end is then its offset.
+        """
+        data = self.data
+        pos = FILE_HEADER_SIZE
+        end = len(data)
+        self.records_end = min(pos, end)
+        while pos < end:
+            if end - pos < RECORD_HEADER_SIZE:
+                print(f"Warning: Corrupt record at position {pos}. Skipping.")
+                return
+            tag, status, length = RECORD_HEADER_STRUCT.unpack_from(data, pos)
+            size = RECORD_HEADER_SIZE + length
+            if length < TASK_ID_STRUCT.size or pos + size > end:
+                print(f"Warning: Corrupt record at position {pos}. Skipping.")
+                return
+            yield pos, size, tag, status
+            pos += size
+            self.records_end = pos
+
+    def task_id_at(self, offset):
+        """Reads just the task ID of the record at a byte offset."""
+        return TASK_ID_STRUCT.unpack_from(self.data, offset + RECORD_HEADER_SIZE)[0]
+
+    def task_at(self, offset, size=None):
+        """Materializes the Task stored at a byte offset."""
+        if size is None:
+            size = RECORD_HEADER_SIZE + RECORD_HEADER_STRUCT.unpack_from(self.data, offset)[2]
+        with self.data[offset:offset + size] as record:  # Released even if decoding fails,
+            return unpack_task(record)                   # so close() can unmap the file
+
+    def record_offsets(self):
+        """Returns the offsets of the live records, loading them on first use."""
+        if self.offsets is None:
+            offsets = self.read_directory()
+            if offsets is None:
+                offsets = array("Q", (offset for offset, size, tag, status in self.scan()
+                                      if not status & TOMBSTONE))
+            self.offsets = memoryview(offsets)
+        return self.offsets
+
+    def read_directory(self):
+        """Reads live offsets from the slot directory, or None if it is missing or stale."""
+        index_file = self.path + ".idx"
+        if not os.path.exists(index_file):
+            return None
+        stat = os.fstat(self.file.fileno())
+        with open(index_file, "rb") as file:
+            directory = file.read()
+        if len(directory) < DIRECTORY_HEADER_SIZE:
+            return None
+        magic, data_size, data_mtime, count = DIRECTORY_HEADER_STRUCT.unpack_from(directory)
+        if magic != DIRECTORY_MAGIC or data_size != stat.st_size or data_mtime != stat.st_mtime_ns:
+            return None
+        entries = memoryview(directory)[DIRECTORY_HEADER_SIZE:DIRECTORY_HEADER_SIZE + count * DIRECTORY_ENTRY_SIZE]
+        return array("Q", (offset for offset, task_id, size, live
+                           in DIRECTORY_ENTRY_STRUCT.iter_unpack(entries) if live))
+
+    def __iter__(self):
+        if self.offsets is None:
+            for offset, size, tag, status in self.scan():
+                if not status & TOMBSTONE:
+                    yield self.task_at(offset, size)
+        else:
+            for offset in self.offsets:
+                yield self.task_at(offset)
+
+    def __len__(self):
+        return len(self.record_offsets())
+
+    def __getitem__(self, index):
+        offsets = self.record_offsets()
+        if isinstance(index, slice):
+            view = object.__new__(TaskFileView)
+            view.path = self.path
+            view.file = self.file
+            view.map = self.map
+            view.data = self.data
+            view.offsets = offsets[index]
+            view.parent = self.parent or self
+            return view
+        return self.task_at(offsets[index])
+
+
+class SecondaryIndex:
+    """
+    Secondary indexes on the completed flag and on priority.
+
+    Completion is kept as two bitmaps indexed by task ID (live tasks and
+    completed tasks); priorities map to sorted posting lists of task IDs.
+    Both are updated incrementally as tasks are written, so a query only
+    visits the IDs that match instead of every record.
+    """
 
     def __init__(self):
-        self.tasks = []
+        self.live = bytearray()
+        self.completed = bytearray()
+        self.priorities = {}  # priority -> sorted array("I") of task IDs
+
+    @staticmethod
+    def set_bit(bitmap, task_id, value):
+        byte, bit = divmod(task_id, 8)
+        if byte >= len(bitmap):
+            if not value:
+                return
+            bitmap.extend(bytes(byte + 1 - len(bitmap)))
+        if value:
+            bitmap[byte] |= 1 << bit
+        else:
+            bitmap[byte] &= ~(1 << bit) & 0xFF
+
+    @staticmethod
+    def get_bit(bitmap, task_id):
+        byte, bit = divmod(task_id, 8)
+        return byte < len(bitmap) and bool(bitmap[byte] >> bit & 1)
+
+    @staticmethod
+    def iter_bits(bitmap):
+        """Yields the set bit positions, skipping zero bytes at C speed."""
+        for match in NONZERO_BYTE.finditer(bitmap):
+            base = match.start() * 8
+            for bit in BITS_IN_BYTE[bitmap[match.start()]]:
+                yield base + bit
+
+    def add(self, task):
+        """Indexes a new or updated task."""
+        self.set_bit(self.live, task.id, True)
+        self.set_bit(self.completed, task.id, task.completed)
+        priority = getattr(task, "priority", None)
+        if priority is not None:
+            postings = self.priorities.setdefault(sys.intern(priority), array("I"))
+            if not postings or postings[-1] < task.id:
+                postings.append(task.id)  # IDs are handed out in increasing order
+            else:
+                pos = bisect_left(postings, task.id)
+                if pos == len(postings) or postings[pos] != task.id:
+                    postings.insert(pos, task.id)
+
+    def remove(self, task):
+        """Drops a deleted task from every index."""
+        self.set_bit(self.live, task.id, False)
+        self.set_bit(self.completed, task.id, False)
+        postings = self.priorities.get(getattr(task, "priority", None))
+        if postings is not None:
+            pos = bisect_left(postings, task.id)
+            if pos < len(postings) and postings[pos] == task.id:
+                del postings[pos]
+
+    def where(self, completed=None, priority=None):
+        """Yields the IDs of the live tasks matching every given condition, in ID order."""
+        if priority is not None:
+            for task_id in self.priorities.get(priority, ()):
+                if completed is None or self.get_bit(self.completed, task_id) == completed:
+                    yield task_id
+        elif completed is None:
+            yield from self.iter_bits(self.live)
+        elif completed:
+            yield from self.iter_bits(self.completed)
+        else:
+            size = len(self.live)
+            pending = (int.from_bytes(self.live, "little")
+                       & ~int.from_bytes(self.completed, "little"))
+            yield from self.iter_bits(pending.to_bytes(size, "little"))
+
+    def rebuild(self, tasks):
+        self.__init__()
+        for task in tasks:
+            self.add(task)
+
+    def load(self, path, data_path):
+        """Reads the index from disk. Returns False if it is missing or stale."""
+        if not os.path.exists(path) or not os.path.exists(data_path):
+            return False
+        stat = os.stat(data_path)
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < SECONDARY_INDEX_HEADER_STRUCT.size:
+            return False
+        magic, data_size, data_mtime, bitmap_size, count = SECONDARY_INDEX_HEADER_STRUCT.unpack_from(data)
+        if magic != SECONDARY_INDEX_MAGIC or data_size != stat.st_size or data_mtime != stat.st_mtime_ns:
+            return False
+
+        pos = SECONDARY_INDEX_HEADER_STRUCT.size
+        self.live = bytearray(data[pos:pos + bitmap_size])
+        self.completed = bytearray(data[pos + bitmap_size:pos + 2 * bitmap_size])
+        pos += 2 * bitmap_size
+        self.priorities = {}
+        for _ in range(count):
+            name_size, id_count = POSTING_HEADER_STRUCT.unpack_from(data, pos)
+            pos += POSTING_HEADER_STRUCT.size
+            name = sys.intern(data[pos:pos + name_size].decode())
+            pos += name_size
+            postings = array("I")
+            postings.frombytes(data[pos:pos + id_count * postings.itemsize])
+            pos += id_count * postings.itemsize
+            self.priorities[name] = postings
+        return True
+
+    def save(self, path, data_path):
+        """Writes the index, stamped with the data file it describes."""
+        if not os.path.exists(data_path):
+            return
+        size = max(len(self.live), len(self.completed))
+        parts = [bytes(self.live).ljust(size, b"\0"), bytes(self.completed).ljust(size, b"\0")]
+        for name, postings in self.priorities.items():
+            encoded = name.encode()
+            parts.append(POSTING_HEADER_STRUCT.pack(len(encoded), len(postings)) + encoded)
+            parts.append(postings.tobytes())
+        stat = os.stat(data_path)
+        with open(path, "wb") as file:
+            file.write(SECONDARY_INDEX_HEADER_STRUCT.pack(SECONDARY_INDEX_MAGIC, stat.st_size,
+                                                          stat.st_mtime_ns, size, len(self.priorities)))
+            file.write(b"".join(parts))
+
+
+class ToDoList:
+    """
+    A class to manage and store tasks in a binary file with random access.
+
+    Start-up only loads the id -> offset index. The data file stays mapped
+    through a TaskFileView and a Task is decoded from it when it is looked
+    up; only tasks added or changed since then are kept as objects (until
+    the next compaction rewrites the file and the view is reopened).
+    """
+
+    def __init__(self, durability=DURABILITY):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"durability must be one of {DURABILITY_LEVELS}")
+        self.durability = durability
+        self.changed = {}   # task ID -> Task written since the view was opened
+        self.offsets = {}   # task ID -> (byte offset, record size), in insertion order
+        self.view = None    # TaskFileView of the data file as it was when opened
+        self.free_slots = {NORMAL_TASK_SIZE: [], HIGH_PRIORITY_TASK_SIZE: []}
+        self.index = SecondaryIndex()
+        self.search_index = TitleIndex()
+        self.task_ids = IdSequence(sequence_path(TASKS_FILE))  # Never reuses a deleted ID
+        self.fd = None      # Data file descriptor, opened on the first write
+        self.end = 0        # Current size of the data file
+        self.wal_fd = None
+        self.wal_size = 0
+        self.wal_lock = threading.Lock()
+        self.commit_timer = None
         self.load_tasks()
 
+    @staticmethod
+    def record_size(task):
+        """Returns the on-disk size of a task record."""
+        return HIGH_PRIORITY_TASK_SIZE if isinstance(task, HighPriorityTask) else NORMAL_TASK_SIZE
+
+    def open_file(self):
+        """Returns the data file descriptor, opening (and if needed creating) the file once."""
+        if self.fd is None:
+            self.fd = os.open(TASKS_FILE, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+            self.end = os.fstat(self.fd).st_size
+            if self.end == 0:
+                write_all(self.fd, file_header(), 0)
+                self.end = FILE_HEADER_SIZE
+        return self.fd
+
+    def close_file(self):
+        self.checkpoint()  # Also cancels a pending group commit
+        with self.wal_lock:
+            if self.commit_timer is not None:
+                self.commit_timer.cancel()
+                self.commit_timer = None
+            if self.wal_fd is not None:
+                os.close(self.wal_fd)
+                self.wal_fd = None
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def write_runs(self, runs):
+        """
+        Writes (offset, data) runs to the data file as one operation. Unless
+        durability is "none", the runs are appended to the write-ahead log first.
+        """
+        fd = self.open_file()
+        if self.durability != "none":
+            self.log_runs(runs)
+        for offset, data in runs:
+            write_all(fd, data, offset)
+        if self.wal_size >= WAL_CHECKPOINT_SIZE:
+            self.checkpoint()
+
+    def log_runs(self, runs):
+        """Appends runs to the write-ahead log and syncs it per the durability level."""
+        if self.wal_fd is None:
+            self.wal_fd = os.open(WAL_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND
+                                  | getattr(os, "O_BINARY", 0), 0o644)
+            self.wal_size = os.fstat(self.wal_fd).st_size
+        entries = b"".join(wal_entry(offset, bytes(data)) for offset, data in runs)
+        with self.wal_lock:
+            write_all_append(self.wal_fd, entries)
+            self.wal_size += len(entries)
+            if self.durability == "fsync":
+                os.fsync(self.wal_fd)
+            elif self.commit_timer is None:
+                self.commit_timer = threading.Timer(GROUP_COMMIT_MS / 1000, self.group_commit)
+                self.commit_timer.daemon = True
+                self.commit_timer.start()
+
+    def group_commit(self):
+        """Timer callback: one fsync covers every entry logged since the last commit."""
+        with self.wal_lock:
+            self.commit_timer = None
+            if self.wal_fd is not None:
+                os.fsync(self.wal_fd)
+
+    def checkpoint(self):
+        """Makes the data file durable, after which the log can be emptied."""
+        with self.wal_lock:
+            if self.commit_timer is not None:
+                self.commit_timer.cancel()
+                self.commit_timer = None
+            if self.fd is not None:
+                os.fsync(self.fd)
+            if self.wal_fd is not None and self.wal_size:
+                os.ftruncate(self.wal_fd, 0)
+                os.fsync(self.wal_fd)
+                self.wal_size = 0
+
+    def replay_wal(self):
+        """Re-applies intact log entries left behind by a crash, then empties the log."""
+        if not os.path.exists(WAL_FILE):
+            return
+        with open(WAL_FILE, "rb") as file:
+            log = file.read()
+        if log:
+            fd = os.open(TASKS_FILE, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+            try:
+                count = 0
+                for offset, data in read_wal(log):
+                    write_all(fd, data, offset)
+                    count += 1
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            print(f"Recovered {count} writes from the write-ahead log.")
+        os.remove(WAL_FILE)
+
     def save_task(self, task, position=None):
-        """Saves a task to the file at a specific position or appends it."""
-        mode = "r+b" if os.path.exists(TASKS_FILE) else "wb"
-        with open(TASKS_FILE, mode) as file:
-            if position is not None:
-                file.seek(position)  # Overwrite at specific position
-            else:
-                file.seek(0, os.SEEK_END)  # Append
-
-            if isinstance(task, HighPriorityTask):
-                file.write(struct.pack("I50s?10s", 
-                                       task.id, 
-                                       task.title.encode().ljust(50, b' '), 
-                                       task.completed, 
-                                       task.priority.encode().ljust(10, b' ')))
+        """
+        Saves a task to the file at a specific position or appends it.
+        Returns the byte offset the record was written at.
+        """
+        self.open_file()
+        if position is None:  # Append
+            position = self.end
+        data = pack_task(task)
+        self.write_runs([(position, data)])
+        self.end = max(self.end, position + len(data))
+        return position
+
+    def allocate_slot(self, task):
+        """
+        Picks the task's existing slot, a reusable free slot, or None to append.
+        If the task no longer fits its slot (it changed type), the old slot is freed.
+        """
+        size = self.record_size(task)
+        if task.id in self.offsets:
+            offset, old_size = self.offsets[task.id]
+            if old_size == size:
+                return offset
+            self.free_task(task.id)
+        if self.free_slots[size]:
+            return self.free_slots[size].pop()
+        return None
+
+    def store_task(self, task):
+        """
+        Writes a task into its existing slot, a reusable free slot,
+        or appends it, and records the slot in the index.
+        """
+        size = self.record_size(task)
+        self.offsets[task.id] = (self.save_task(task, self.allocate_slot(task)), size)
+        self.changed[task.id] = task
+        self.index.add(task)
+        self.search_index.add(task.id, task.title)
+
+    def save_many(self, tasks):
+        """
+        Stores a batch of tasks. All records are packed into one preallocated
+        buffer, and each run of contiguous slots is written with a single call.
+        """
+        self.open_file()
+        placed = []
+        for task in tasks:
+            size = self.record_size(task)
+            old_task = self.get_task(task.id)
+            if old_task is not None:
+                self.index.remove(old_task)  # Its priority may have changed
+            position = self.allocate_slot(task)
+            if position is None:
+                position = self.end
+                self.end += size
+            self.offsets[task.id] = (position, size)
+            self.changed[task.id] = task
+            self.task_ids.advance_past(task.id)
+            self.index.add(task)
+            self.search_index.add(task.id, task.title)
+            placed.append((position, size, task))
+        if not placed:
+            return
+        placed.sort(key=lambda item: item[0])
+
+        buffer = pack_records([task for _, _, task in placed])
+        runs = []  # (file offset, buffer start, buffer end)
+        cursor = 0
+        for position, size, task in placed:
+            if runs and runs[-1][0] + (runs[-1][2] - runs[-1][1]) == position:
+                runs[-1] = (runs[-1][0], runs[-1][1], cursor + size)
             else:
-                file.write(struct.pack("I50s?", 
-                                       task.id, 
-                                       task.title.encode().ljust(50, b' '), 
-                                       task.completed))
+                runs.append((position, cursor, cursor + size))
+            cursor += size
+
+        view = memoryview(buffer)
+        self.write_runs([(position, view[start:stop]) for position, start, stop in runs])
+
+    def free_task(self, task_id):
+        """Flips the tombstone flag of a task's record in place and puts its slot on the free-list."""
+        offset, size = self.offsets.pop(task_id)
+        self.write_runs([(offset + STATUS_OFFSET, bytes([TOMBSTONE]))])
+        self.free_slots[size].append(offset)
+
+    def dead_ratio(self):
+        """Returns the fraction of records in the file that are tombstones."""
+        dead = sum(len(offsets) for offsets in self.free_slots.values())
+        total = dead + len(self.offsets)
+        return dead / total if total else 0.0
+
+    def maybe_compact(self):
+        """Compacts the file once the dead-record ratio crosses COMPACT_RATIO."""
+        dead = sum(len(offsets) for offsets in self.free_slots.values())
+        if dead + len(self.offsets) >= COMPACT_MIN_RECORDS and self.dead_ratio() >= COMPACT_RATIO:
+            self.compact()
+
+    def compact(self):
+        """
+        Rewrites the live records to a temporary file in one streaming pass,
+        then atomically renames it over the data file.
+        """
+        if not os.path.exists(TASKS_FILE):
+            return
+        self.checkpoint()  # Logged offsets refer to the old layout
+        temp_file = TASKS_FILE + ".tmp"
+        new_offsets = {}
+        live = sorted(self.offsets.items(), key=lambda item: item[1][0])  # File order
+        with open(TASKS_FILE, "rb") as src, open(temp_file, "wb") as dst:
+            dst.write(file_header())
+            for task_id, (offset, size) in live:
+                src.seek(offset)
+                new_offsets[task_id] = (dst.tell(), size)
+                dst.write(src.read(size))
+            dst.flush()
+            os.fsync(dst.fileno())
+        self.close_file()
+        self.close_view()
+        os.replace(temp_file, TASKS_FILE)
+
+        self.offsets = new_offsets
+        self.free_slots = {NORMAL_TASK_SIZE: [], HIGH_PRIORITY_TASK_SIZE: []}
+        self.view = TaskFileView(TASKS_FILE)  # Holds every task again
+        self.changed = {}
+        self.save_index()
+
+    def close_view(self):
+        if self.view is not None:
+            self.view.close()
+            self.view = None
+
+    def get_task(self, task_id):
+        """Returns a task, decoding it from the mapped file unless it was changed; None if there is none."""
+        task = self.changed.get(task_id)
+        if task is None and task_id in self.offsets:
+            offset, size = self.offsets[task_id]
+            task = self.view.task_at(offset, size)
+        return task
+
+    def iter_tasks(self):
+        """Yields every task, decoding one record at a time."""
+        for task_id in self.offsets:
+            yield self.get_task(task_id)
 
     def load_tasks(self):
-        """Loads tasks from a binary file using random access, ensuring correct alignment."""
+        """
+        Loads the slot directory, rebuilding it if it is missing or stale, and
+        maps the data file. Tasks themselves are only decoded when accessed.
+        """
+        self.replay_wal()
         if not os.path.exists(TASKS_FILE):
             return
 
-        self.tasks = []
+        if is_legacy_file(TASKS_FILE):
+            count = migrate_legacy_file(TASKS_FILE)
+            print(f"Migrated {count} tasks from the old file format.")
+
         with open(TASKS_FILE, "rb") as file:
-            while True:
-                pos = file.tell()  # Get current position
-                data = file.read(NORMAL_TASK_SIZE)  # Read a full normal task record
+            magic, version, _ = struct.unpack(FILE_HEADER, file.read(FILE_HEADER_SIZE))
+            if version > FORMAT_VERSION:
+                raise ValueError(f"{TASKS_FILE} uses format version {version}, "
+                                 f"this program only understands up to {FORMAT_VERSION}")
 
-                if not data:  # End of file
-                    break  
+        if not self.load_index():
+            self.rebuild_index()
 
-                if len(data) == NORMAL_TASK_SIZE:  # Standard task
-                    task_id, title, completed = struct.unpack("I50s?", data)
-                    title = title.decode().strip()
-                    task = Task(task_id, title)
+        self.view = TaskFileView(TASKS_FILE)  # Tasks are decoded from it on access
+        self.task_ids.advance_past(max(self.offsets, default=0))
+        if not self.index.load(SECONDARY_INDEX_FILE, TASKS_FILE):
+            self.index.rebuild(self.iter_tasks())
+        if not self.search_index.load(index_path(TASKS_FILE), TASKS_FILE):
+            self.search_index.rebuild((task.id, task.title) for task in self.iter_tasks())
 
-                elif len(data) == HIGH_PRIORITY_TASK_SIZE:  # High-priority task
-                    task_id, title, completed, priority = struct.unpack("I50s?10s", data)
-                    title = title.decode().strip()
-                    priority = priority.decode().strip()
-                    task = HighPriorityTask(task_id, title, priority)
+    def rebuild_index(self):
+        """
+        Scans the data file once to rebuild the id -> offset index and
+        free-list. A torn record at the end (less than one record left over)
+        is cut off, so new records are appended right after the last whole
+        one. Damage anywhere else is not repaired: the file is copied to
+        <file>.corrupt.bak and ValueError is raised, so no task is dropped.
+        """
+        self.offsets = {}
+        self.free_slots = {NORMAL_TASK_SIZE: [], HIGH_PRIORITY_TASK_SIZE: []}
+        with TaskFileView(TASKS_FILE) as view:
+            for offset, size, tag, status in view.scan():
+                if status & TOMBSTONE:
+                    self.free_slots.setdefault(size, []).append(offset)
+                elif tag in (TAG_TASK, TAG_HIGH_PRIORITY):
+                    self.offsets[view.task_id_at(offset)] = (offset, size)
+            records_end, file_size = view.records_end, len(view.data)
+        if records_end is None or records_end >= file_size:
+            return
+        if file_size - records_end >= HIGH_PRIORITY_TASK_SIZE:  # More than a torn last write
+            backup = TASKS_FILE + ".corrupt.bak"
+            shutil.copy2(TASKS_FILE, backup)
+            raise ValueError(f"{TASKS_FILE} is damaged at byte {records_end}; "
+                             f"a copy was saved as {backup}. Not opening it to avoid losing tasks.")
+        print(f"Removing {file_size - records_end} bytes of a torn record at the end of {TASKS_FILE}.")
+        os.truncate(TASKS_FILE, records_end)
 
+    def load_index(self):
+        """
+        Reads the slot directory. Returns False if it is missing or
+        does not match the current data file, so it must be rebuilt.
+        """
+        if not os.path.exists(INDEX_FILE):
+            return False
+        stat = os.stat(TASKS_FILE)
+        with open(INDEX_FILE, "rb") as file:
+            header = file.read(DIRECTORY_HEADER_SIZE)
+            if len(header) != DIRECTORY_HEADER_SIZE:
+                return False
+            magic, data_size, data_mtime, count = DIRECTORY_HEADER_STRUCT.unpack(header)
+            if magic != DIRECTORY_MAGIC or data_size != stat.st_size or data_mtime != stat.st_mtime_ns:
+                return False
+
+            self.offsets = {}
+            self.free_slots = {NORMAL_TASK_SIZE: [], HIGH_PRIORITY_TASK_SIZE: []}
+            entries = file.read(count * DIRECTORY_ENTRY_SIZE)
+            for offset, task_id, size, live in DIRECTORY_ENTRY_STRUCT.iter_unpack(entries):
+                if live:
+                    self.offsets[task_id] = (offset, size)
                 else:
-                    print(f"Warning: Corrupt record at position {pos}. Skipping.")
-                    break  # Avoid crashing on corrupt files
+                    self.free_slots.setdefault(size, []).append(offset)
+        return True
+
+    def save_index(self):
+        """Writes the slot directory, one fixed-width entry per record slot in file order."""
+        if not os.path.exists(TASKS_FILE):
+            return
+        slots = [(offset, task_id, size, 1) for task_id, (offset, size) in self.offsets.items()]
+        slots += [(offset, 0, size, 0) for size, offsets in self.free_slots.items() for offset in offsets]
+        slots.sort()
+
+        buffer = bytearray(DIRECTORY_HEADER_SIZE + len(slots) * DIRECTORY_ENTRY_SIZE)
+        for i, slot in enumerate(slots):
+            DIRECTORY_ENTRY_STRUCT.pack_into(buffer, DIRECTORY_HEADER_SIZE + i * DIRECTORY_ENTRY_SIZE, *slot)
+
+        stat = os.stat(TASKS_FILE)
+        DIRECTORY_HEADER_STRUCT.pack_into(buffer, 0, DIRECTORY_MAGIC, stat.st_size,
+                                          stat.st_mtime_ns, len(slots))
+        with open(INDEX_FILE, "wb") as file:
+            file.write(buffer)
+
+    def close(self):
+        """Persists the slot directory and secondary indexes so the next start-up can skip the full scan."""
+        self.close_file()
+        self.close_view()
+        self.task_ids.close()
+        self.save_index()
+        self.index.save(SECONDARY_INDEX_FILE, TASKS_FILE)
+        self.search_index.save(index_path(TASKS_FILE), TASKS_FILE)
 
-                task.completed = completed
-                self.tasks.append(task)
+    def where(self, completed=None, priority=None):
+        """
+        Returns the tasks matching the given completion status and/or
+        priority, e.g. where(completed=False, priority="High").
+        """
+        return [self.get_task(task_id) for task_id in self.index.where(completed, priority)]
 
+    def search(self, query, limit=10):
+        """Returns up to `limit` tasks whose titles best match the query."""
+        return [self.get_task(task_id) for task_id in self.search_index.search(query, limit)]
+
+    def search_tasks(self):
+        """Prompts for a query and prints the best matching tasks."""
+        query = input("Enter search words: ")
+        results = self.search(query)
+        if not results:
+            print("No matching tasks found.")
+        for task in results:
+            print(task)
 
     def view_tasks(self):
         """Displays the list of tasks."""
-        if not self.tasks:
+        if not self.offsets:
             print("Your to-do list is empty!")
         else:
             print("\nYour To-Do List:")
-            for task in self.tasks:
+            for task in self.iter_tasks():
                 print(task)
 
     def add_task(self, title, high_priority=False):
         """Adds a new task and appends it to the binary file."""
-        new_id = len(self.tasks) + 1
+        new_id = self.task_ids.allocate()
         if high_priority:
             priority = input("Enter the priority (e.g. High, Medium, Low): ")
             new_task = HighPriorityTask(new_id, title, priority)
         else:
             new_task = Task(new_id, title)
 
-        self.tasks.append(new_task)
-        self.save_task(new_task)  # Append task to file
+        self.store_task(new_task)  # Reuse a free slot or append to file
         print(f"Task '{title}' added successfully!")
 
     def edit_task(self):
         """Edits the title of an existing task using random access."""
         self.view_tasks()
-        if self.tasks:
+        if self.offsets:
             try:
                 task_id = int(input("Enter the task ID to edit: "))
-                for index, task in enumerate(self.tasks):
-                    if task.id == task_id:
-                        new_title = input("Enter the updated title: ")
-                        task.title = new_title
-
-                        position = index * (HIGH_PRIORITY_TASK_SIZE if isinstance(task, HighPriorityTask) else NORMAL_TASK_SIZE)
-                        self.save_task(task, position)  # Overwrite at position
-                        print("Task updated successfully!")
-                        return
-                print("Task ID not found!")
+                task = self.get_task(task_id)
+                if task is None:
+                    print("Task ID not found!")
+                    return
+                new_title = input("Enter the updated title: ")
+                task.title = new_title
+                self.store_task(task)  # Overwrite at indexed position
+                print("Task updated successfully!")
             except ValueError:
                 print("Please enter a valid number!")
 
     def delete_task(self):
-        """Deletes a task by marking it as inactive (or rewriting the file)."""
+        """Deletes a task by tombstoning its slot so a new task can reuse it."""
         self.view_tasks()
-        if self.tasks:
+        if self.offsets:
             try:
                 task_id = int(input("Enter the task ID to delete: "))
-                for index, task in enumerate(self.tasks):
-                    if task.id == task_id:
-                        self.tasks.remove(task)
-
-                        # Rewrite file without the deleted task
-                        with open(TASKS_FILE, "wb") as file:
-                            for t in self.tasks:
-                                self.save_task(t)
-                        
-                        print("Task deleted successfully!")
-                        return
-                print("Task ID not found!")
+                task = self.get_task(task_id)
+                if task is None:
+                    print("Task ID not found!")
+                    return
+                self.changed.pop(task_id, None)
+                self.free_task(task_id)
+                self.index.remove(task)
+                self.search_index.remove(task_id)
+                self.maybe_compact()
+                print("Task deleted successfully!")
             except ValueError:
                 print("Please enter a valid number!")
 
     def toggle_task_completion(self):
         """Toggles the completion status of a task using random access."""
         self.view_tasks()
-        if self.tasks:
+        if self.offsets:
             try:
                 task_id = int(input("Enter the task ID to toggle completion: "))
-                for index, task in enumerate(self.tasks):
-                    if task.id == task_id:
-                        task.toggle_completion()
-
-                        position = index * (HIGH_PRIORITY_TASK_SIZE if isinstance(task, HighPriorityTask) else NORMAL_TASK_SIZE)
-                        self.save_task(task, position)  # Overwrite at position
-                        status = "completed" if task.completed else "not completed"
-                        print(f"Task '{task.title}' is now {status}.")
-                        return
-                print("Task ID not found!")
+                task = self.get_task(task_id)
+                if task is None:
+                    print("Task ID not found!")
+                    return
+                task.toggle_completion()
+                self.store_task(task)  # Overwrite at indexed position
+                status = "completed" if task.completed else "not completed"
+                print(f"Task '{task.title}' is now {status}.")
             except ValueError:
                 print("Please enter a valid number!")
 
@@ -184,15 +1010,32 @@ def display_menu():
     print("4. Edit Task")
     print("5. Delete Task")
     print("6. Toggle Task Completion")
-    print("7. Exit")
+    print("7. Search Tasks")
+    print("8. Compact Storage")
+    print("9. Exit")
     print("------------------------")
 
 def main():
-    todo_list = ToDoList()  # Loads tasks from file on startup
+    if len(sys.argv) > 1 and sys.argv[1] == "migrate":
+        path = sys.argv[2] if len(sys.argv) > 2 else TASKS_FILE
+        if not is_legacy_file(path):
+            print(f"{path} is already in the current format.")
+        else:
+            print(f"Migrated {migrate_legacy_file(path)} tasks; original kept as {path}.v0.bak")
+        return
+
+    durability = DURABILITY
+    if len(sys.argv) > 2 and sys.argv[1] == "--durability":
+        durability = sys.argv[2]
+    try:
+        todo_list = ToDoList(durability)  # Replays the log and loads tasks on startup
+    except ValueError as error:
+        print(f"Error: {error}")
+        return
 
     while True:
         display_menu()
-        choice = input("Enter your choice (1-7): ")
+        choice = input("Enter your choice (1-9): ")
 
         if choice == "1":
             todo_list.view_tasks()
@@ -209,6 +1052,12 @@ def main():
         elif choice == "6":
             todo_list.toggle_task_completion()
         elif choice == "7":
+            todo_list.search_tasks()
+        elif choice == "8":
+            todo_list.compact()
+            print("Storage compacted.")
+        elif choice == "9":
+            todo_list.close()
             print("Exiting To-Do App. Goodbye!")
             break
         else:
@@ -1,3 +1,9 @@
+from id_sequence import IdSequence
+
+# IDs keep counting up, so a deleted task's ID is never given to a new one
+task_ids = IdSequence()
+
+
 # A simple terminal-based To-Do app with dictionaries
 def display_menu():
     print("\n--- To-Do List Menu ---")
@@ -23,7 +29,7 @@ def view_tasks(tasks):
 def add_task(tasks):
     title = input("Enter the task title: ")
     new_task = {
-        "id": len(tasks) + 1,  # Auto-increment ID
+        "id": task_ids.allocate(),  # Auto-increment ID
         "title": title,
         "completed": False
     }
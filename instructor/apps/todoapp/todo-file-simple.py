@@ -1,77 +1,34 @@
+from atomic_file import BackgroundWriter
+from id_sequence import IdSequence, sequence_path
+from pipe_codec import format_records, read_records
+from task_table import TaskTable
 
 TASKS_FILE = "todos.txt"
 
-class Task:
-    """A simple Task class."""
-    def __init__(self, task_id, title):
-        self.id = task_id
-        self.title = title
-        self.completed = False
-
-    def toggle_completion(self):
-        """Toggle the completion status of the task."""
-        self.completed = not self.completed
-
-    def __str__(self):
-        status = "✔" if self.completed else "✘"
-        return f"ID: {self.id} | [{status}] {self.title}"
-
-
-class HighPriorityTask(Task):
-    """
-    A specialized Task with a priority attribute.
-    Demonstrates inheritance from the base Task class.
-    """
-    def __init__(self, task_id, title, priority):
-        super().__init__(task_id, title)  # Initialize the parent (Task) attributes
-        self.priority = priority
-
-    def __str__(self):
-        """
-        Override the string representation to include priority.
-        """
-        status = "✔" if self.completed else "✘"
-        return f"ID: {self.id} | [{status}] {self.title} (Priority: {self.priority})"
-
+# Saves are written by a background thread so the menu never waits for the disk
+writer = BackgroundWriter()
 
+# Task IDs, saved next to the task file so they are never reused
+task_ids = IdSequence(sequence_path(TASKS_FILE))
 
 class ToDoList:
-    """A class to manage and store tasks in a list using simple file I/O."""
+    """A class to manage and store tasks in a TaskTable using simple file I/O."""
 
     def __init__(self):
-        self.tasks = []
+        self.tasks = TaskTable()  # Columns instead of one object per task
         self.load_tasks()  # Load tasks from the file on startup
 
     def save_tasks(self):
         """Saves the tasks to a file in a simple text format."""
-        with open(TASKS_FILE, "w") as file:
-            for task in self.tasks:
-                if isinstance(task, HighPriorityTask):
-                    file.write(f"{task.id}|{task.title}|{task.completed}|{task.priority}\n")
-                else:
-                    file.write(f"{task.id}|{task.title}|{task.completed}\n")
+        writer.submit(TASKS_FILE, format_records((task.id, task.title, task.completed,
+                                                  getattr(task, "priority", None))
+                                                 for task in self.tasks))
 
     def load_tasks(self):
         """Loads tasks from a file."""
-        try:
-            with open(TASKS_FILE, "r") as file:
-                self.tasks = []
-                for line in file:
-                    parts = line.strip().split("|")
-                    task_id = int(parts[0])
-                    title = parts[1]
-                    completed = parts[2] == "True"
-                    
-                    if len(parts) == 4:  # If priority is present
-                        priority = parts[3]
-                        task = HighPriorityTask(task_id, title, priority)
-                    else:
-                        task = Task(task_id, title)
-                    
-                    task.completed = completed
-                    self.tasks.append(task)
-        except FileNotFoundError:
-            self.tasks = []
+        self.tasks = TaskTable.from_records(read_records(TASKS_FILE))
+        if self.tasks.ids:
+            task_ids.advance_past(self.tasks.ids[-1])  # IDs are sorted
 
     def view_tasks(self):
         """Displays the list of tasks."""
@@ -84,14 +41,12 @@ class ToDoList:
 
     def add_task(self, title, high_priority=False):
         """Adds a task and saves to file."""
-        new_id = len(self.tasks) + 1
+        new_id = task_ids.allocate()  # Never reused, even after a delete
+        priority = None
         if high_priority:
             priority = input("Enter the priority (e.g. High, Medium, Low): ")
-            new_task = HighPriorityTask(new_id, title, priority)
-        else:
-            new_task = Task(new_id, title)
 
-        self.tasks.append(new_task)
+        self.tasks.append(new_id, title, priority=priority)
         self.save_tasks()  # Save after adding
         print(f"Task '{title}' added successfully!")
 
@@ -101,14 +56,14 @@ class ToDoList:
         if self.tasks:
             try:
                 task_id = int(input("Enter the task ID to edit: "))
-                for task in self.tasks:
-                    if task.id == task_id:
-                        new_title = input("Enter the updated title: ")
-                        task.title = new_title
-                        self.save_tasks()  # Save after editing
-                        print("Task updated successfully!")
-                        return
-                print("Task ID not found!")
+                task = self.tasks.get(task_id)
+                if task is None:
+                    print("Task ID not found!")
+                    return
+                new_title = input("Enter the updated title: ")
+                task.title = new_title
+                self.save_tasks()  # Save after editing
+                print("Task updated successfully!")
             except ValueError:
                 print("Please enter a valid number!")
 
@@ -118,13 +73,13 @@ class ToDoList:
         if self.tasks:
             try:
                 task_id = int(input("Enter the task ID to delete: "))
-                for task in self.tasks:
-                    if task.id == task_id:
-                        self.tasks.remove(task)
-                        self.save_tasks()  # Save after deletion
-                        print("Task deleted successfully!")
-                        return
-                print("Task ID not found!")
+                if not self.tasks.delete(task_id):
+                    print("Task ID not found!")
+                    return
+                if self.tasks.deleted > len(self.tasks):
+                    self.tasks.compact()  # Mostly deleted rows: drop them
+                self.save_tasks()  # Save after deletion
+                print("Task deleted successfully!")
             except ValueError:
                 print("Please enter a valid number!")
 
@@ -134,14 +89,14 @@ class ToDoList:
         if self.tasks:
             try:
                 task_id = int(input("Enter the task ID to toggle completion: "))
-                for task in self.tasks:
-                    if task.id == task_id:
-                        task.toggle_completion()
-                        self.save_tasks()  # Save after toggling completion
-                        status = "completed" if task.completed else "not completed"
-                        print(f"Task '{task.title}' is now {status}.")
-                        return
-                print("Task ID not found!")
+                task = self.tasks.get(task_id)
+                if task is None:
+                    print("Task ID not found!")
+                    return
+                task.toggle_completion()
+                self.save_tasks()  # Save after toggling completion
+                status = "completed" if task.completed else "not completed"
+                print(f"Task '{task.title}' is now {status}.")
             except ValueError:
                 print("Please enter a valid number!")
 
@@ -180,6 +135,8 @@ def main():
         elif choice == "6":
             todo_list.toggle_task_completion()
         elif choice == "7":
+            writer.flush()
+            task_ids.close()
             print("Exiting To-Do App. Goodbye!")
             break
         else:
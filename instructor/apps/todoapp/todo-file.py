@@ -1,5 +1,10 @@
 import os
 
+from atomic_file import atomic_write
+from id_sequence import IdSequence, sequence_path
+from pipe_codec import HEADER, escape, format_records, read_records, unescape
+from title_index import TitleIndex, index_path
+
 # Get the absolute path of the current script's directory (todoapp)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -12,6 +17,20 @@ os.makedirs(DATA_DIR, exist_ok=True)
 # File path for storing the tasks
 FILE_NAME = os.path.join(DATA_DIR, "todo_list.txt")
 
+# Change-log mode: each change appends one line to LOG_FILE instead of
+# rewriting FILE_NAME. The log is folded into FILE_NAME (a "checkpoint")
+# once it grows past CHECKPOINT_RATIO times the size of FILE_NAME.
+CHANGE_LOG = True
+LOG_FILE = FILE_NAME + ".log"
+CHECKPOINT_RATIO = 0.5
+CHECKPOINT_MIN_BYTES = 4096  # Don't checkpoint tiny lists on every change
+
+# Word index over task titles, kept in step with every change
+title_index = TitleIndex()
+
+# Task IDs, saved next to the task file so they are never reused
+task_ids = IdSequence(sequence_path(FILE_NAME))
+
 
 # A simple terminal-based To-Do app with dictionaries and file persistence
 def display_menu():
@@ -21,32 +40,95 @@ def display_menu():
     print("3. Edit Task")
     print("4. Delete Task")
     print("5. Toggle Task Completion")
-    print("6. Exit")
+    print("6. Search Tasks")
+    print("7. Exit")
     print("------------------------")
 
 
 def load_tasks():
-    """Load tasks from a text file into a list of dictionaries."""
-    tasks = []
-    if os.path.exists(FILE_NAME):
-        with open(FILE_NAME, "r") as file:
-            for line in file:
-                parts = line.strip().split('|')
-                if len(parts) == 3:
-                    task_id, title, completed = parts
-                    tasks.append({
-                        "id": int(task_id),
-                        "title": title,
-                        "completed": completed == "True"
-                    })
+    """Load tasks from a text file into a list of dictionaries, then replay the change log."""
+    tasks = [{"id": task_id, "title": title, "completed": completed}
+             for task_id, title, completed, priority in read_records(FILE_NAME)]
+    if os.path.exists(LOG_FILE):
+        tasks, escaped = replay_log(tasks)
+        if not escaped:
+            checkpoint(tasks)  # New entries are escaped; don't append them to an old log
+    task_ids.advance_past(max((task['id'] for task in tasks), default=0))
     return tasks
 
 
+def replay_log(tasks, log_file=LOG_FILE):
+    """
+    Apply the change log on top of the tasks from the last checkpoint.
+    Every entry sets a final value, so replaying one twice is harmless.
+    A half-written last line (from a crash) is cut off. Titles are only
+    unescaped if the log starts with the HEADER line. Returns the tasks and
+    whether the log was escaped.
+    """
+    by_id = {task['id']: task for task in tasks}
+    complete = 0  # Bytes of whole lines
+    with open(log_file, "rb") as file:
+        escaped = file.readline() == HEADER.encode()
+        file.seek(0)
+        decode = unescape if escaped else str
+        for raw_line in file:
+            if not raw_line.endswith(b"\n"):
+                break
+            complete += len(raw_line)
+            operation, _, fields = raw_line[:-1].decode(errors="replace").partition('|')
+            try:
+                if operation == "ADD":
+                    task_id, completed, title = fields.split('|', 2)
+                    by_id[int(task_id)] = {"id": int(task_id), "title": decode(title),
+                                           "completed": completed == "True"}
+                elif operation == "EDIT":
+                    task_id, title = fields.split('|', 1)
+                    by_id[int(task_id)]['title'] = decode(title)
+                elif operation == "TOGGLE":
+                    task_id, completed = fields.split('|')
+                    by_id[int(task_id)]['completed'] = completed == "True"
+                elif operation == "DEL":
+                    by_id.pop(int(fields), None)
+            except (ValueError, KeyError):
+                continue  # Skip a damaged entry
+    if complete < os.path.getsize(log_file):
+        os.truncate(log_file, complete)  # So the next entry starts on its own line
+    return list(by_id.values()), escaped
+
+
 def save_tasks(tasks):
-    """Save the list of tasks to a text file."""
-    with open(FILE_NAME, "w") as file:
-        for task in tasks:
-            file.write(f"{task['id']}|{task['title']}|{task['completed']}\n")
+    """Save the list of tasks to a text file, replacing it atomically."""
+    atomic_write(FILE_NAME, format_records((task['id'], task['title'], task['completed'], None) for task in tasks))
+
+
+def log_change(tasks, *fields):
+    """
+    Record one change. In change-log mode that is one appended line, e.g.
+    "TOGGLE|3|True"; otherwise the whole list is saved. Titles are escaped
+    like in the task file.
+    """
+    if not CHANGE_LOG:
+        save_tasks(tasks)
+        return
+    with open(LOG_FILE, "a", encoding="utf-8") as file:
+        if file.tell() == 0:
+            file.write(HEADER)
+        file.write("|".join(str(field) for field in fields) + "\n")
+    snapshot_size = os.path.getsize(FILE_NAME) if os.path.exists(FILE_NAME) else 0
+    if os.path.getsize(LOG_FILE) > CHECKPOINT_RATIO * max(snapshot_size, CHECKPOINT_MIN_BYTES):
+        checkpoint(tasks)
+
+
+def checkpoint(tasks):
+    """Fold the change log into the task file and start a new log."""
+    save_tasks(tasks)
+    if os.path.exists(LOG_FILE):
+        os.remove(LOG_FILE)
+
+
+def stamp_file():
+    """The file the title index is stamped with: whichever one changes last."""
+    return LOG_FILE if os.path.exists(LOG_FILE) else FILE_NAME
 
 
 def view_tasks(tasks):
@@ -64,12 +146,13 @@ def add_task(tasks):
     """Add a new task."""
     title = input("Enter the task title: ")
     new_task = {
-        "id": len(tasks) + 1 if tasks else 1,  # Auto-increment ID
+        "id": task_ids.allocate(),  # Never reused, even after a delete
         "title": title,
         "completed": False
     }
     tasks.append(new_task)
-    save_tasks(tasks)
+    title_index.add(new_task['id'], title)
+    log_change(tasks, "ADD", new_task['id'], new_task['completed'], escape(title))
     print(f"Task '{title}' added successfully!")
 
 
@@ -83,7 +166,8 @@ def edit_task(tasks):
                 if task['id'] == task_id:
                     new_title = input("Enter the updated title: ")
                     task['title'] = new_title
-                    save_tasks(tasks)
+                    title_index.add(task_id, new_title)
+                    log_change(tasks, "EDIT", task_id, escape(new_title))
                     print("Task updated successfully!")
                     return
             print("Task ID not found!")
@@ -100,7 +184,8 @@ def delete_task(tasks):
             for task in tasks:
                 if task['id'] == task_id:
                     tasks.remove(task)
-                    save_tasks(tasks)
+                    title_index.remove(task_id)
+                    log_change(tasks, "DEL", task_id)
                     print("Task deleted successfully!")
                     return
             print("Task ID not found!")
@@ -118,7 +203,7 @@ def toggle_task_completion(tasks):
                 if task['id'] == task_id:
                     task['completed'] = not task['completed']
                     status = "completed" if task['completed'] else "not completed"
-                    save_tasks(tasks)
+                    log_change(tasks, "TOGGLE", task_id, task['completed'])
                     print(f"Task '{task['title']}' is now {status}.")
                     return
             print("Task ID not found!")
@@ -126,12 +211,26 @@ def toggle_task_completion(tasks):
             print("Please enter a valid number!")
 
 
+def search_tasks(tasks):
+    """Find tasks whose titles match some words."""
+    query = input("Enter search words: ")
+    by_id = {task['id']: task for task in tasks}
+    results = [by_id[task_id] for task_id in title_index.search(query) if task_id in by_id]
+    if not results:
+        print("No matching tasks found.")
+    for task in results:
+        status = "✔" if task['completed'] else "✘"
+        print(f"ID: {task['id']} | [{status}] {task['title']}")
+
+
 def main():
     """Main program loop."""
     tasks = load_tasks()
+    if not title_index.load(index_path(FILE_NAME), stamp_file()):
+        title_index.rebuild((task['id'], task['title']) for task in tasks)
     while True:
         display_menu()
-        choice = input("Enter your choice (1-6): ")
+        choice = input("Enter your choice (1-7): ")
 
         if choice == "1":
             view_tasks(tasks)
@@ -144,6 +243,10 @@ def main():
         elif choice == "5":
             toggle_task_completion(tasks)
         elif choice == "6":
+            search_tasks(tasks)
+        elif choice == "7":
+            title_index.save(index_path(FILE_NAME), stamp_file())
+            task_ids.close()
             print("Exiting To-Do App. Goodbye!")
             break
         else:
@@ -0,0 +1,381 @@
+"""
+Bulk import/export for the todo stores.
+
+    python todo-io.py import tasks.csv todos.dat
+    python todo-io.py export todos.db tasks.jsonl
+    python todo-io.py convert data/todo_list.txt todos.dat
+
+The format of each side is picked from its extension:
+
+    .csv    CSV with an id,title,completed,priority header
+    .jsonl  one JSON object per line with the same keys
+    .dat    binary store of todo-binary-random-access.py
+    .db     fixed-width store of todo-random-access.py
+    .txt    pipe-delimited store of todo-file.py / todo-file-simple.py
+            (a todo-file.py change log next to it is folded in first)
+
+Tasks are streamed: they are read, validated and written in batches of
+BATCH_SIZE, so memory stays flat however large the files are. Importing
+into an existing store appends to it and gives the new tasks fresh IDs
+after the store's highest one. The .db store always renumbers imported
+tasks, because its slot map rebuilds itself from the IDs in the file.
+"""
+import csv
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import pipe_codec
+from id_sequence import IdSequence, sequence_path
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BATCH_SIZE = 10_000
+CSV_FIELDS = ["id", "title", "completed", "priority"]
+TRUE_VALUES = {"true", "1", "yes", "y", "done", "✔"}
+FALSE_VALUES = {"false", "0", "no", "n", "", "✘"}
+
+
+def load_script(filename):
+    """Imports one of the sibling todo scripts (their names are not valid module names)."""
+    name = filename[:-3].replace("-", "_")
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(BASE_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[name] = module
+    return sys.modules[name]
+
+
+def batched(iterable, size=BATCH_SIZE):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# -------------------------------------------------------------------------
+# Validation: every reader yields plain dicts that pass through here
+# -------------------------------------------------------------------------
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"invalid completed value {value!r}")
+
+
+def validate(record):
+    """Normalizes a raw record to {id, title, completed, priority} or raises ValueError."""
+    title = record.get("title")
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError("missing title")
+    task_id = record.get("id")
+    if task_id in (None, ""):
+        task_id = None
+    else:
+        task_id = int(task_id)
+        if task_id <= 0:
+            raise ValueError(f"invalid id {task_id}")
+    priority = record.get("priority") or None
+    if priority is not None and not isinstance(priority, str):
+        raise ValueError(f"invalid priority {priority!r}")
+    return {"id": task_id, "title": title.strip(), "completed": parse_bool(record.get("completed", False)),
+            "priority": priority}
+
+
+# -------------------------------------------------------------------------
+# Readers: stream records out of each format
+# -------------------------------------------------------------------------
+def read_csv(path):
+    with open(path, "r", newline="", encoding="utf-8") as file:
+        yield from csv.DictReader(file)
+
+
+def read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def fold_change_log(path):
+    """
+    Folds the change log of todo-file.py (<path>.log) into the task file, so
+    the file holds every change before it is read or appended to. Replaying
+    the log needs all tasks in memory, just like todo-file.py itself.
+    """
+    log_file = path + ".log"
+    if not os.path.exists(log_file):
+        return
+    app = load_script("todo-file.py")
+    tasks = []
+    if os.path.exists(path):
+        tasks = [{"id": task_id, "title": title, "completed": completed, "priority": priority}
+                 for task_id, title, completed, priority in pipe_codec.read_records(path)]
+    tasks, escaped = app.replay_log(tasks, log_file)
+    pipe_codec.write_records(path, ((task["id"], task["title"], task["completed"], task.get("priority"))
+                                    for task in tasks))
+    os.remove(log_file)
+
+
+def read_pipe(path):
+    fold_change_log(path)
+    for chunk in pipe_codec.iter_chunks(path):
+        for task_id, title, completed, priority in chunk:
+            yield {"id": task_id, "title": title, "completed": completed, "priority": priority}
+
+
+def read_fixed(path):
+    store = load_script("todo-random-access.py")
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(store.RECORD_SIZE * BATCH_SIZE)
+            if not chunk:
+                break
+            for pos in range(0, len(chunk) - store.RECORD_SIZE + 1, store.RECORD_SIZE):
+                task = store.unpack_task(chunk[pos:pos + store.RECORD_SIZE])
+                if task["title"] != "DELETED":
+                    yield task
+
+
+def read_binary(path):
+    store = load_script("todo-binary-random-access.py")
+    if store.is_legacy_file(path):
+        with open(path, "rb") as file:
+            yield from (task_record(task) for task in store.read_legacy_tasks(file))
+    else:
+        with store.TaskFileView(path) as view:
+            yield from (task_record(task) for task in view)
+
+
+def task_record(task):
+    return {"id": task.id, "title": task.title, "completed": task.completed,
+            "priority": getattr(task, "priority", None)}
+
+
+# -------------------------------------------------------------------------
+# Writers: open the target once, then write one validated batch at a time
+# -------------------------------------------------------------------------
+class Writer:
+    """
+    Base class for the writers; tracks the next free task ID. IDs written to
+    a fresh file are remembered in a bitmap (bit i = task ID i), one bit per
+    ID instead of one set entry per record, to reject duplicates.
+    """
+    max_id = None  # Largest ID the format can store, if it has a limit
+
+    def __init__(self, path):
+        self.path = path
+        self.append = os.path.exists(path) and os.path.getsize(path) > 0
+        self.next_id = 1
+        self.written = bytearray()  # Bitmap of the IDs written to a fresh file
+
+    def assign_id(self, record):
+        """
+        Keeps the record's ID in a fresh file, otherwise numbers it after the
+        existing tasks. Raises ValueError for an ID that was already written
+        or that the target format cannot store, before anything is written.
+        """
+        task_id = self.next_id if self.append or record["id"] is None else record["id"]
+        if self.max_id is not None and task_id > self.max_id:
+            raise ValueError(f"id {task_id} does not fit {self.path} (at most {self.max_id})")
+        byte, bit = divmod(task_id, 8)
+        if not self.append:
+            if byte >= len(self.written):
+                self.written.extend(bytes(byte + 1 - len(self.written)))
+            elif self.written[byte] >> bit & 1:
+                raise ValueError(f"duplicate id {task_id}")
+            self.written[byte] |= 1 << bit
+        record["id"] = task_id
+        self.next_id = max(self.next_id, task_id) + 1
+        return record
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter(Writer):
+    def __init__(self, path):
+        super().__init__(path)
+        self.append = False  # Exports always replace the target
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, CSV_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, batch):
+        self.writer.writerows(batch)
+
+
+class JsonlWriter(Writer):
+    def __init__(self, path):
+        super().__init__(path)
+        self.append = False
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, batch):
+        self.file.write("".join(json.dumps(record, ensure_ascii=False) + "\n"
+                                for record in batch))
+
+
+class PipeWriter(Writer):
+    def __init__(self, path):
+        super().__init__(path)
+        fold_change_log(path)
+        self.append = os.path.exists(path) and os.path.getsize(path) > 0
+        self.ids = IdSequence(sequence_path(path))  # Shared with the todo scripts
+        if self.append:
+            pipe_codec.upgrade_file(path)  # New lines are escaped, so older lines must be too
+            for record in read_pipe(path):
+                self.ids.advance_past(int(record["id"]))
+        self.file = open(path, "a", encoding="utf-8")
+        if not self.append:
+            self.file.write(pipe_codec.HEADER)
+
+    def assign_id(self, record):
+        """Takes new IDs from the store's ID sequence, so deleted IDs are not reused."""
+        self.next_id = self.ids.next_id
+        record = super().assign_id(record)
+        self.ids.advance_past(record["id"])
+        return record
+
+    def write(self, batch):
+        lines = []
+        for record in batch:
+            lines.append(pipe_codec.format_line(record["id"], record["title"], record["completed"], record["priority"]))
+        self.file.write("".join(lines))
+
+    def close(self):
+        super().close()
+        self.ids.close()  # Saves the next ID
+
+
+class FixedWidthWriter(Writer):
+    def __init__(self, path):
+        super().__init__(path)
+        self.store = load_script("todo-random-access.py")
+        self.max_id = self.store.MAX_TASK_ID
+        self.append = True  # Always renumber so IDs stay unique in the slot map
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                while True:  # Whole records at a time, so memory stays flat
+                    chunk = file.read(self.store.RECORD_SIZE * BATCH_SIZE)
+                    if not chunk:
+                        break
+                    for match in self.store.RECORD_PATTERN.finditer(chunk):
+                        if match.start() % self.store.RECORD_SIZE == 0:
+                            self.next_id = max(self.next_id, int(match.group(1)) + 1)
+        self.file = open(path, "ab")
+
+    def write(self, batch):
+        self.file.write(b"".join(self.store.pack_task(record) for record in batch))
+
+
+class BinaryWriter(Writer):
+    max_id = 2 ** 32 - 1  # IDs are stored as uint32
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.store = load_script("todo-binary-random-access.py")
+        wal = path + ".wal"
+        if os.path.exists(wal) and os.path.getsize(wal):
+            raise ValueError(f"{path} has an unapplied write-ahead log; "
+                             "open it with todo-binary-random-access.py first")
+        if self.append:
+            if self.store.is_legacy_file(path):
+                self.store.migrate_legacy_file(path)
+            with self.store.TaskFileView(path) as view:
+                for offset, size, tag, status in view.scan():
+                    self.next_id = max(self.next_id, view.task_id_at(offset) + 1)
+            self.file = open(path, "ab")
+        else:
+            self.file = open(path, "wb")
+            self.file.write(self.store.file_header())
+
+    def write(self, batch):
+        store = self.store
+        tasks = []
+        for record in batch:
+            if record["priority"]:
+                task = store.HighPriorityTask(record["id"], record["title"], record["priority"])
+            else:
+                task = store.Task(record["id"], record["title"])
+            task.completed = record["completed"]
+            tasks.append(task)
+        self.file.write(store.pack_records(tasks))
+
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl, "txt": read_pipe, "db": read_fixed, "dat": read_binary}
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "txt": PipeWriter, "db": FixedWidthWriter,
+           "dat": BinaryWriter}
+
+
+def file_format(path):
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    if extension not in READERS:
+        raise ValueError(f"Unknown file type for {path}; expected one of: {', '.join(READERS)}")
+    return extension
+
+
+def transfer(source, target, strict=False, progress=True):
+    """
+    Streams every task from source into target. Invalid records are reported
+    and skipped (or abort the run with strict=True). Returns (written, skipped).
+    """
+    reader = READERS[file_format(source)]
+    writer = WRITERS[file_format(target)](target)
+    written = skipped = 0
+    started = time.perf_counter()
+    try:
+        for number, batch in enumerate(batched(reader(source)), 1):
+            valid = []
+            for position, record in enumerate(batch, 1):
+                try:
+                    valid.append(writer.assign_id(validate(record)))
+                except (ValueError, TypeError) as error:
+                    record_number = (number - 1) * BATCH_SIZE + position
+                    if strict:
+                        raise ValueError(f"record {record_number}: {error}") from None
+                    print(f"Skipping record {record_number}: {error}", file=sys.stderr)
+                    skipped += 1
+            writer.write(valid)
+            written += len(valid)
+            if progress:
+                rate = written / max(time.perf_counter() - started, 1e-9)
+                print(f"\r{written:,} tasks written ({rate:,.0f}/s)", end="", file=sys.stderr)
+    finally:
+        writer.close()
+        if progress:
+            print(file=sys.stderr)
+    return written, skipped
+
+
+def main():
+    usage = ("usage: python todo-io.py import SOURCE STORE\n"
+             "       python todo-io.py export STORE TARGET\n"
+             "       python todo-io.py convert SOURCE TARGET\n"
+             "options: --strict  stop at the first invalid record")
+    args = [arg for arg in sys.argv[1:] if arg != "--strict"]
+    if len(args) != 3 or args[0] not in ("import", "export", "convert"):
+        print(usage)
+        return 1
+    command, source, target = args
+    try:
+        written, skipped = transfer(source, target, strict="--strict" in sys.argv)
+    except (OSError, ValueError) as error:
+        print(f"{command} failed: {error}", file=sys.stderr)
+        return 1
+    print(f"{command}: {written} tasks written to {target}" + (f", {skipped} skipped" if skipped else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
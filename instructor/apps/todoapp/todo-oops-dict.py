@@ -5,18 +5,21 @@ Explanation of Key OOP Concepts
 --------------------------------------------
 Classes (Task, HighPriorityTask, ToDoList)
 
+The classes live in task_model.py, which the todo-ui-*.py apps share.
 Each class represents a concept.
 - Task is the base class with basic attributes (id, title, and completed).
 - HighPriorityTask inherits from Task, adding a priority attribute and an overridden __str__ method.
-- ToDoList manages a collection of Task objects.
+- ToDoList manages a collection of Task objects. It finds a task by ID with a dict lookup
+  instead of looping over every task.
 
 Inheritance
 - HighPriorityTask uses super().__init__(...) to invoke the parent (Task) constructor, inheriting its 
   attributes and methods but also adding or overriding where needed.
 
 Methods
-- Inside the ToDoList class, we have methods like add_task, view_tasks, edit_task, delete_task, and 
-  toggle_task_completion.
+- Inside the ToDoList class, we have methods like add_task, get, edit_task, toggle_task and
+  delete_task. The menu functions in this file (view_tasks, edit_task, ...) only ask for input
+  and call them.
   
   These methods encapsulate the logic for each operation, improving clarity and reusability.
 
@@ -29,117 +32,85 @@ extend (e.g., adding new task types, or storing/saving tasks in a file/database)
 
 """
 
-# task.py
-class Task:
-    """A simple Task class."""
-    def __init__(self, task_id, title):
-        self.id = task_id
-        self.title = title
-        self.completed = False
+from task_model import ToDoList
 
-    def toggle_completion(self):
-        """Toggle the completion status of the task."""
-        self.completed = not self.completed
 
-    def __str__(self):
-        status = "✔" if self.completed else "✘"
-        return f"ID: {self.id} | [{status}] {self.title}"
+# Menu actions: each one asks for input and calls the shared ToDoList model
+def view_tasks(todo_list):
+    """Displays the list of tasks."""
+    if not len(todo_list):
+        print("Your to-do list is empty!")
+    else:
+        print("\nYour To-Do List:")
+        for task in todo_list:
+            print(task)
 
 
-class HighPriorityTask(Task):
+def add_task(todo_list, title, high_priority=False):
     """
-    A specialized Task with a priority attribute.
-    Demonstrates inheritance from the base Task class.
+    Adds a task. If high_priority is True,
+    a HighPriorityTask is created instead of a regular Task.
     """
-    def __init__(self, task_id, title, priority):
-        super().__init__(task_id, title)  # Initialize the parent (Task) attributes
-        self.priority = priority
-
-    def __str__(self):
-        """
-        Override the string representation to include priority.
-        """
-        status = "✔" if self.completed else "✘"
-        return f"ID: {self.id} | [{status}] {self.title} (Priority: {self.priority})"
-
-
-# to_do_list.py
-class ToDoList:
-    """A class to manage and store tasks in a list."""
-    def __init__(self):
-        self.tasks = []
-
-    def view_tasks(self):
-        """Displays the list of tasks."""
-        if not self.tasks:
-            print("Your to-do list is empty!")
+    priority = None
+    if high_priority:
+        # Ask for priority only if user wants a HighPriorityTask
+        priority = input("Enter the priority (e.g. High, Medium, Low): ")
+    todo_list.add_task(title, priority)
+    print(f"Task '{title}' added successfully!")
+
+
+def ask_task_id(todo_list, action):
+    """Shows the tasks and asks for an ID. Returns None if there are no tasks."""
+    view_tasks(todo_list)
+    if len(todo_list):
+        return int(input(f"Enter the task ID to {action}: "))
+    return None
+
+
+def edit_task(todo_list):
+    """Edits the title of an existing task."""
+    try:
+        task_id = ask_task_id(todo_list, "edit")
+        if task_id is None:
+            return
+        if task_id in todo_list:
+            new_title = input("Enter the updated title: ")
+            todo_list.edit_task(task_id, new_title)
+            print("Task updated successfully!")
         else:
-            print("\nYour To-Do List:")
-            for task in self.tasks:
-                print(task)
-
-    def add_task(self, title, high_priority=False):
-        """
-        Adds a task. If high_priority is True,
-        a HighPriorityTask is created instead of a regular Task.
-        """
-        new_id = len(self.tasks) + 1
-        if high_priority:
-            # Ask for priority only if user wants a HighPriorityTask
-            priority = input("Enter the priority (e.g. High, Medium, Low): ")
-            new_task = HighPriorityTask(new_id, title, priority)
+            print("Task ID not found!")
+    except ValueError:
+        print("Please enter a valid number!")
+
+
+def delete_task(todo_list):
+    """Deletes a task."""
+    try:
+        task_id = ask_task_id(todo_list, "delete")
+        if task_id is None:
+            return
+        if todo_list.delete_task(task_id):
+            print("Task deleted successfully!")
         else:
-            new_task = Task(new_id, title)
-
-        self.tasks.append(new_task)
-        print(f"Task '{title}' added successfully!")
-
-    def edit_task(self):
-        """Edits the title of an existing task."""
-        self.view_tasks()
-        if self.tasks:
-            try:
-                task_id = int(input("Enter the task ID to edit: "))
-                for task in self.tasks:
-                    if task.id == task_id:
-                        new_title = input("Enter the updated title: ")
-                        task.title = new_title
-                        print("Task updated successfully!")
-                        return
-                print("Task ID not found!")
-            except ValueError:
-                print("Please enter a valid number!")
-
-    def delete_task(self):
-        """Deletes a task."""
-        self.view_tasks()
-        if self.tasks:
-            try:
-                task_id = int(input("Enter the task ID to delete: "))
-                for task in self.tasks:
-                    if task.id == task_id:
-                        self.tasks.remove(task)
-                        print("Task deleted successfully!")
-                        return
-                print("Task ID not found!")
-            except ValueError:
-                print("Please enter a valid number!")
-
-    def toggle_task_completion(self):
-        """Toggles the completion status of a task."""
-        self.view_tasks()
-        if self.tasks:
-            try:
-                task_id = int(input("Enter the task ID to toggle completion: "))
-                for task in self.tasks:
-                    if task.id == task_id:
-                        task.toggle_completion()
-                        status = "completed" if task.completed else "not completed"
-                        print(f"Task '{task.title}' is now {status}.")
-                        return
-                print("Task ID not found!")
-            except ValueError:
-                print("Please enter a valid number!")
+            print("Task ID not found!")
+    except ValueError:
+        print("Please enter a valid number!")
+
+
+def toggle_task_completion(todo_list):
+    """Toggles the completion status of a task."""
+    try:
+        task_id = ask_task_id(todo_list, "toggle completion")
+        if task_id is None:
+            return
+        if todo_list.toggle_task(task_id):
+            task = todo_list.get(task_id)
+            status = "completed" if task.completed else "not completed"
+            print(f"Task '{task.title}' is now {status}.")
+        else:
+            print("Task ID not found!")
+    except ValueError:
+        print("Please enter a valid number!")
 
 
 # main.py
@@ -163,19 +134,19 @@ def main():
         choice = input("Enter your choice (1-7): ")
 
         if choice == "1":
-            todo_list.view_tasks()
+            view_tasks(todo_list)
         elif choice == "2":
             title = input("Enter the task title: ")
-            todo_list.add_task(title, high_priority=False)
+            add_task(todo_list, title, high_priority=False)
         elif choice == "3":
             title = input("Enter the task title: ")
-            todo_list.add_task(title, high_priority=True)
+            add_task(todo_list, title, high_priority=True)
         elif choice == "4":
-            todo_list.edit_task()
+            edit_task(todo_list)
         elif choice == "5":
-            todo_list.delete_task()
+            delete_task(todo_list)
         elif choice == "6":
-            todo_list.toggle_task_completion()
+            toggle_task_completion(todo_list)
         elif choice == "7":
             print("Exiting To-Do App. Goodbye!")
             break
@@ -1,153 +1,783 @@
 import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager, redirect_stdout
+
+try:
+    import fcntl  # POSIX only; shared mode needs it for byte-range locks
+except ImportError:
+    fcntl = None
+
+try:
+    import numpy as np  # Optional; only load_numpy() and its helpers need it
+except ImportError:
+    np = None
+
+from title_index import TitleIndex, index_path
 
 RECORD_SIZE = 62  # 4 + 1 + 50 + 1 + 5 + 1
+MAX_TASK_ID = 9999  # The ID column holds 4 digits
 DB_FILE = "todos.db"
+PAGE_SIZE = 4096  # Cache block size; records may straddle two blocks
+CACHE_PAGES = 256  # 1 MiB of cached blocks by default
+SCAN_CHUNK = 65536  # Records decoded per read by iter_tasks (about 4 MiB)
+
+MAP_SUFFIX = ".map"  # Persistent task ID -> slot map, next to the data file
+MAP_BUFFER_SIZE = 1024  # New IDs collected before merging into the sorted arrays
+MAP_MAGIC = b"TMAP"
+MAP_HEADER = struct.Struct("<4sQQIII")  # magic, data size, data mtime (ns), count, free count, next ID
+
+SEQUENCE_SUFFIX = ".lock"  # Next task ID; locking it reserves the end of the file
+SEQUENCE = struct.Struct("<Q")
 
+# One whole record: ID, title and completed flag, each in its fixed column
+RECORD_PATTERN = re.compile(rb"(\d{4})\|(.{50})\|(True |False)\n", re.DOTALL)
 
-def pack_task(task: dict) -> str:
+# Word index over task titles, kept in step with every change
+title_index = TitleIndex()
+
+
+def encode_title(title: str) -> bytes:
+    """
+    Encode a title as exactly 50 bytes of UTF-8: truncated on a character
+    boundary if it is too long, padded with spaces if it is too short.
     """
-    Convert a task dict into a fixed-size record string of length RECORD_SIZE.
+    data = title.encode("utf-8")
+    if len(data) > 50:
+        data = data[:50].decode("utf-8", errors="ignore").encode("utf-8")
+    return data.ljust(50, b" ")
+
+
+def pack_task(task: dict) -> bytes:
+    """
+    Convert a task dict into a fixed-size record of exactly RECORD_SIZE bytes.
     Format: ID(4) + '|' + Title(50) + '|' + Completed(5) + '\n'
     """
-    task_id = f"{task['id']:04d}"         # 4 digits, zero-padded
-    title = task['title'][:50]            # truncate if longer than 50
-    title = f"{title:<50}"                # left-justify in 50-char field
-    completed = "True " if task['completed'] else "False"
-    record_str = f"{task_id}|{title}|{completed}\n"
-    return record_str
+    task_id = b"%04d" % task['id']       # 4 digits, zero-padded
+    title = encode_title(task['title'])  # 50 bytes, whatever the characters
+    completed = b"True " if task['completed'] else b"False"
+    return task_id + b"|" + title + b"|" + completed + b"\n"
 
 
-def unpack_task(record_line: str) -> dict:
+def unpack_task(record: bytes) -> dict:
     """
-    Convert a 62-byte record line back into a task dict.
+    Convert a 62-byte record back into a task dict.
     """
-    # Expecting something like: "0001|Buy milk                                          |False\n"
-    # Slicing the string based on known positions
-    task_id_str = record_line[0:4]
-    title_str = record_line[5:55]
-    completed_str = record_line[56:61]
+    # Expecting something like: b"0001|Buy milk                                          |False\n"
+    # Slicing the bytes based on known positions
+    task_id_str = record[0:4]
+    title_str = record[5:55]
+    completed_str = record[56:61]
 
     task_dict = {
         "id": int(task_id_str),
-        "title": title_str.strip(),
-        "completed": completed_str.strip() == "True"
+        "title": title_str.decode("utf-8", errors="replace").strip(),
+        "completed": completed_str.strip() == b"True"
     }
     return task_dict
 
 
+class TaskDB:
+    """
+    Keeps one file descriptor open on the task file and caches it in
+    PAGE_SIZE blocks with least-recently-used eviction.
+
+    Writes only change the cached blocks and mark them dirty ("write-back");
+    dirty blocks reach the file when they are evicted, on flush() and on close().
+
+    With shared=True several processes may use the file at once. The cache
+    is then bypassed, every read and write goes straight to the file, and
+    record changes are made under an fcntl lock on just that record's bytes.
+    """
+
+    def __init__(self, path: str, cache_pages: int = CACHE_PAGES, page_size: int = PAGE_SIZE,
+                 shared: bool = False):
+        if shared and fcntl is None:
+            raise OSError("Shared mode needs fcntl, which this platform does not have.")
+        self.path = path
+        self.cache_pages = cache_pages
+        self.page_size = page_size
+        self.shared = shared
+        self.fd = None
+        self.size = 0
+        self.pages = OrderedDict()  # page number -> bytearray, oldest first
+        self.dirty = set()
+
+    def open(self) -> int:
+        if self.fd is None:
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+            self.size = os.fstat(self.fd).st_size
+        return self.fd
+
+    def pread(self, length: int, offset: int) -> bytes:
+        fd = self.open()
+        if hasattr(os, "pread"):
+            return os.pread(fd, length, offset)
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, length)
+
+    def pwrite(self, data: bytes, offset: int):
+        fd = self.open()
+        if hasattr(os, "pwrite"):
+            os.pwrite(fd, data, offset)
+        else:
+            os.lseek(fd, offset, os.SEEK_SET)
+            os.write(fd, data)
+
+    def count(self) -> int:
+        """
+        Returns how many records the file holds, including unflushed appends.
+        """
+        self.open()
+        if self.shared:
+            self.size = os.fstat(self.fd).st_size  # Other processes may have appended
+        return self.size // RECORD_SIZE
+
+    def page(self, number: int) -> bytearray:
+        """
+        Returns a cached block, reading it from the file on a miss.
+        """
+        page = self.pages.get(number)
+        if page is not None:
+            self.pages.move_to_end(number)
+            return page
+        page = bytearray(self.pread(self.page_size, number * self.page_size))
+        page.extend(bytes(self.page_size - len(page)))
+        self.pages[number] = page
+        while len(self.pages) > self.cache_pages:
+            old_number, old_page = self.pages.popitem(last=False)
+            if old_number in self.dirty:
+                self.write_page(old_number, old_page)
+        return page
+
+    def write_page(self, number: int, page: bytearray):
+        start = number * self.page_size
+        length = min(self.page_size, self.size - start)
+        if length > 0:
+            self.pwrite(bytes(page[:length]), start)
+        self.dirty.discard(number)
+
+    def read_record(self, index: int):
+        """
+        Returns the raw bytes of one record, or None past the end of the file.
+        """
+        if index < 0 or index >= self.count():
+            return None
+        offset = index * RECORD_SIZE
+        if self.shared:
+            return self.pread(RECORD_SIZE, offset)
+        data = bytearray()
+        while len(data) < RECORD_SIZE:
+            number, start = divmod(offset + len(data), self.page_size)
+            data += self.page(number)[start:start + RECORD_SIZE - len(data)]
+        return bytes(data)
+
+    def write_record(self, index: int, data: bytes):
+        """
+        Writes one record into the cache; index == count() appends.
+        """
+        if len(data) != RECORD_SIZE:
+            raise ValueError("Record string is not the expected length.")
+        offset = index * RECORD_SIZE
+        self.open()
+        if self.shared:
+            self.pwrite(data, offset)
+            return
+        self.size = max(self.size, offset + RECORD_SIZE)
+        done = 0
+        while done < RECORD_SIZE:
+            number, start = divmod(offset + done, self.page_size)
+            chunk = min(RECORD_SIZE - done, self.page_size - start)
+            self.page(number)[start:start + chunk] = data[done:done + chunk]
+            self.dirty.add(number)
+            done += chunk
+
+    def read_records(self, start: int = 0, stop: int = None) -> bytes:
+        """
+        Reads a run of records with one sequential read, bypassing the cache.
+        """
+        self.flush()
+        count = self.count()
+        stop = count if stop is None else min(stop, count)
+        if start >= stop:
+            return b""
+        return self.pread((stop - start) * RECORD_SIZE, start * RECORD_SIZE)
+
+    @contextmanager
+    def locked(self, index: int):
+        """
+        Holds an exclusive lock on one record while the block runs, so a
+        read-modify-write of it cannot interleave with another process.
+        Does nothing unless the database is shared.
+        """
+        if not self.shared:
+            yield
+            return
+        fd = self.open()
+        fcntl.lockf(fd, fcntl.LOCK_EX, RECORD_SIZE, index * RECORD_SIZE, os.SEEK_SET)
+        try:
+            yield
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN, RECORD_SIZE, index * RECORD_SIZE, os.SEEK_SET)
+
+    def flush(self):
+        """
+        Writes every dirty block back to the file.
+        """
+        for number in sorted(self.dirty):
+            self.write_page(number, self.pages[number])
+
+    def invalidate(self):
+        """
+        Writes dirty blocks back and drops every cached block, for when the
+        file was changed behind the cache (e.g. through load_numpy()).
+        """
+        self.flush()
+        self.pages.clear()
+        if self.fd is not None:
+            self.size = os.fstat(self.fd).st_size
+
+    def close(self):
+        self.flush()
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        self.pages.clear()
+
+
+class SlotMap:
+    """
+    Maps task IDs to record slots so IDs do not have to match positions.
+
+    IDs live in a sorted array("I") searched with bisect, with a parallel
+    array of slots. New IDs go to a small append buffer first and are
+    merged into the sorted arrays in one pass once MAP_BUFFER_SIZE of them
+    have piled up. Slots of deleted records are kept on a free-list and
+    reused by the next create, so the file stays dense.
+
+    `db` is the TaskDB the map describes; rebuilds scan it and, in shared
+    mode, IDs are reserved in its sequence file.
+    """
+
+    def __init__(self, db: "TaskDB"):
+        self.db = db
+        self.clear()
+
+    def clear(self):
+        self.ids = array("I")
+        self.slots = array("I")
+        self.buffer = {}        # task ID -> slot, not yet merged
+        self.free = array("I")  # slots holding DELETED records
+        self.next_id = 1
+        self.loaded = False
+
+    def __len__(self):
+        return len(self.ids) + len(self.buffer)
+
+    def find(self, task_id: int):
+        """
+        Returns the slot of a task, or None.
+        """
+        slot = self.buffer.get(task_id)
+        if slot is not None:
+            return slot
+        pos = bisect_left(self.ids, task_id)
+        if pos < len(self.ids) and self.ids[pos] == task_id:
+            return self.slots[pos]
+        return None
+
+    def add(self, task_id: int, slot: int):
+        self.buffer[task_id] = slot
+        self.next_id = max(self.next_id, task_id + 1)
+        if len(self.buffer) >= MAP_BUFFER_SIZE:
+            self.merge()
+
+    def remove(self, task_id: int):
+        if self.buffer.pop(task_id, None) is not None:
+            return
+        pos = bisect_left(self.ids, task_id)
+        if pos < len(self.ids) and self.ids[pos] == task_id:
+            del self.ids[pos]
+            del self.slots[pos]
+
+    def merge(self):
+        """
+        Folds the append buffer into the sorted arrays.
+        """
+        if not self.buffer:
+            return
+        pairs = sorted(list(zip(self.ids, self.slots)) + list(self.buffer.items()))
+        self.ids = array("I", (task_id for task_id, slot in pairs))
+        self.slots = array("I", (slot for task_id, slot in pairs))
+        self.buffer = {}
+
+    def allocate_slot(self, count: int) -> int:
+        """
+        Returns a free slot to reuse, or `count` to append a new record.
+        """
+        return self.free.pop() if self.free else count
+
+    @contextmanager
+    def reserve(self):
+        """
+        Yields the next task ID and marks it used. In shared mode the ID
+        comes from the database's SEQUENCE_SUFFIX file, which stays locked
+        until the block ends, so only one process at a time picks an ID and
+        appends a record.
+        """
+        if not self.db.shared:
+            task_id = self.next_id
+            yield task_id
+            self.next_id = max(self.next_id, task_id + 1)
+            return
+        fd = os.open(self.db.path + SEQUENCE_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+            data = os.pread(fd, SEQUENCE.size, 0)
+            task_id = max(SEQUENCE.unpack(data)[0] if len(data) == SEQUENCE.size else 1, self.next_id)
+            yield task_id
+            os.pwrite(fd, SEQUENCE.pack(task_id + 1), 0)
+            self.next_id = task_id + 1
+        finally:
+            os.close(fd)  # Closing the descriptor releases the lock
+
+    def rebuild(self, path: str):
+        """
+        Scans the data file once to recreate the map. The map's own TaskDB
+        is used when `path` is its file, so unflushed writes are seen.
+        """
+        if path != self.db.path:
+            source = TaskDB(path)
+            try:
+                self.scan(source)
+            finally:
+                source.close()
+        else:
+            self.scan(self.db)
+
+    def scan(self, source: "TaskDB"):
+        self.clear()
+        pairs = []
+        for chunk_start in range(0, source.count(), SCAN_CHUNK):
+            data = source.read_records(chunk_start, chunk_start + SCAN_CHUNK)
+            for match in RECORD_PATTERN.finditer(data):
+                if match.start() % RECORD_SIZE:
+                    continue  # Not on a record boundary
+                slot = chunk_start + match.start() // RECORD_SIZE
+                task_id = int(match.group(1))
+                self.next_id = max(self.next_id, task_id + 1)
+                if match.group(2).rstrip() == b"DELETED":
+                    self.free.append(slot)
+                else:
+                    pairs.append((task_id, slot))
+        pairs.sort()
+        self.ids = array("I", (task_id for task_id, slot in pairs))
+        self.slots = array("I", (slot for task_id, slot in pairs))
+        self.loaded = True
+
+    def load(self, path: str, data_path: str) -> bool:
+        """
+        Reads the saved map. Returns False if it is missing or stale.
+        """
+        if not os.path.exists(path) or not os.path.exists(data_path):
+            return False
+        stat = os.stat(data_path)
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < MAP_HEADER.size:
+            return False
+        magic, size, mtime, count, free_count, next_id = MAP_HEADER.unpack_from(data)
+        if magic != MAP_MAGIC or size != stat.st_size or mtime != stat.st_mtime_ns:
+            return False
+        self.clear()
+        pos = MAP_HEADER.size
+        for column, length in ((self.ids, count), (self.slots, count), (self.free, free_count)):
+            column.frombytes(data[pos:pos + length * column.itemsize])
+            pos += length * column.itemsize
+        self.next_id = next_id
+        self.loaded = True
+        return True
+
+    def save(self, path: str, data_path: str):
+        """
+        Writes the map, stamped with the data file it describes.
+        """
+        if not os.path.exists(data_path):
+            return
+        self.merge()
+        stat = os.stat(data_path)
+        with open(path, "wb") as f:
+            f.write(MAP_HEADER.pack(MAP_MAGIC, stat.st_size, stat.st_mtime_ns,
+                                    len(self.ids), len(self.free), self.next_id))
+            f.write(self.ids.tobytes() + self.slots.tobytes() + self.free.tobytes())
+
+
+db = TaskDB(DB_FILE)
+slot_map = SlotMap(db)
+
+
+def use_shared_db(path: str = DB_FILE):
+    """
+    Switch to a database that other processes may use at the same time.
+    """
+    global db
+    db.close()
+    db = TaskDB(path, shared=True)
+    slot_map.db = db
+    slot_map.loaded = False
+
+
+def load_slot_map():
+    """
+    Load the ID -> slot map on first use, rebuilding it if it is stale.
+    """
+    if not slot_map.loaded and not slot_map.load(db.path + MAP_SUFFIX, db.path):
+        slot_map.rebuild(db.path)
+
+
+def read_task(task_id: int) -> dict:
+    """
+    Look a task up by ID through the slot map. Returns None if there is none.
+    """
+    slot = find_slot(task_id)
+    return None if slot is None else read_task_at(slot, task_id)
+
+
+def find_slot(task_id: int):
+    """
+    Return the slot of a task. In shared mode an unknown ID may have been
+    created by another process, so the map is rebuilt once before giving up.
+    """
+    load_slot_map()
+    slot = slot_map.find(task_id)
+    if slot is None and db.shared:
+        slot_map.rebuild(db.path)
+        slot = slot_map.find(task_id)
+    return slot
+
+
+def read_task_at(slot: int, task_id: int) -> dict:
+    """
+    Read the task in a slot, or None if the slot now holds a different task.
+    """
+    task = read_task_by_index(slot)
+    if not task or task["id"] != task_id or task["title"] == "DELETED":
+        return None
+    return task
+
+
 def get_task_count():
     """
     Returns how many tasks are in the file by checking the file size.
     """
-    if not os.path.exists(DB_FILE):
-        return 0
-    file_size = os.path.getsize(DB_FILE)
-    # Each record is RECORD_SIZE bytes
-    return file_size // RECORD_SIZE
+    return db.count()
 
 
 def read_task_by_index(index: int) -> dict:
     """
     Read the task at given index (0-based) from the file.
     """
-    with open(DB_FILE, "r") as f:
-        offset = index * RECORD_SIZE
-        f.seek(offset)
-        record_line = f.read(RECORD_SIZE)
-        if len(record_line) < RECORD_SIZE:
-            # Reached EOF or invalid read
-            return None
-        return unpack_task(record_line)
+    record = db.read_record(index)
+    if record is None:
+        # Reached EOF or invalid read
+        return None
+    return unpack_task(record)
 
 
 def write_task_at_index(index: int, task: dict):
     """
     Write a task dict at the given index.
     """
-    record_str = pack_task(task)
-    if len(record_str) != RECORD_SIZE:
-        raise ValueError("Record string is not the expected length.")
-    with open(DB_FILE, "r+") as f:
-        offset = index * RECORD_SIZE
-        f.seek(offset)
-        f.write(record_str)
+    db.write_record(index, pack_task(task))
 
 
 def create_task(title: str, completed: bool = False):
     """
-    Create a new task by appending at the end of the file.
+    Create a new task in the slot of a deleted one, or at the end of the file.
     """
-    current_count = get_task_count()
-    new_id = current_count + 1  # Simple ID assignment
-    task = {
-        "id": new_id,
-        "title": title,
-        "completed": completed
-    }
-    record_str = pack_task(task)
-    with open(DB_FILE, "a") as f:
-        f.write(record_str)
+    load_slot_map()
+    with slot_map.reserve() as new_id:
+        if new_id > MAX_TASK_ID:
+            # IDs are never reused, so this file cannot take more tasks
+            print(f"Error: task IDs have reached {MAX_TASK_ID}, the most a record can hold.")
+            return
+        task = {
+            "id": new_id,
+            "title": title,
+            "completed": completed
+        }
+        slot = None
+        while slot is None and slot_map.free:
+            candidate = slot_map.free.pop()
+            with db.locked(candidate):
+                # Another process may have reused this slot since we saw it freed
+                old_task = read_task_by_index(candidate)
+                if old_task and old_task["title"] == "DELETED":
+                    write_task_at_index(candidate, task)
+                    slot = candidate
+        if slot is None:
+            slot = get_task_count()
+            write_task_at_index(slot, task)  # Append; reserve() keeps this exclusive
+        slot_map.add(new_id, slot)
+    title_index.add(new_id, title)
     print(f"Task created with ID {new_id}")
 
 
+def modify_task(task_id: int, change) -> dict:
+    """
+    Read a task, let change(task) edit the dict, and write it back, all
+    while holding the record's lock. Returns the new task, or None if
+    there is no such task.
+    """
+    slot = find_slot(task_id)
+    if slot is None:
+        return None
+    with db.locked(slot):
+        task = read_task_at(slot, task_id)
+        if task is None:
+            return None
+        change(task)
+        write_task_at_index(slot, task)
+    return task
+
+
 def update_task(task_id: int, title: str = None, completed: bool = None):
     """
     Find the task by ID, update its fields, and overwrite in place.
     """
-    # Task IDs are 1-based, but our file index is 0-based.
-    index = task_id - 1
+    def change(task):
+        if title is not None:
+            task["title"] = title
+        if completed is not None:
+            task["completed"] = completed
 
-    existing_task = read_task_by_index(index)
-    if not existing_task or existing_task["id"] != task_id:
+    task = modify_task(task_id, change)
+    if not task:
         print("Task not found.")
         return
-
-    if title is not None:
-        existing_task["title"] = title
-    if completed is not None:
-        existing_task["completed"] = completed
-
-    write_task_at_index(index, existing_task)
+    title_index.add(task_id, task["title"])
     print(f"Task {task_id} updated successfully.")
 
 
 def delete_task(task_id: int):
     """
-    Mark a task as deleted or clear it. We'll just set title to 'DELETED'.
+    Mark a task as deleted by setting its title to 'DELETED'. The slot is
+    then reused by the next task that is created.
     """
-    index = task_id - 1
-    existing_task = read_task_by_index(index)
-    if not existing_task or existing_task["id"] != task_id:
+    def change(task):
+        # For demonstration, we set the title to "DELETED" and completed = False
+        task["title"] = "DELETED"
+        task["completed"] = False
+
+    if not modify_task(task_id, change):
         print("Task not found.")
         return
-
-    # For demonstration, we set the title to "DELETED" and completed = False
-    existing_task["title"] = "DELETED"
-    existing_task["completed"] = False
-    write_task_at_index(index, existing_task)
+    slot = slot_map.find(task_id)
+    slot_map.remove(task_id)
+    slot_map.free.append(slot)
+    title_index.remove(task_id)
     print(f"Task {task_id} marked as DELETED.")
 
 
-def list_all_tasks():
+def iter_tasks(start: int = 0, stop: int = None, chunk: int = SCAN_CHUNK, as_tuples: bool = False):
     """
-    Print all tasks from the file. Skips over empty/invalid records.
+    Stream tasks start..stop (0-based indexes) from the file, reading `chunk`
+    records at a time and decoding each chunk with one compiled regex.
+    Yields task dicts, or (id, title, completed) tuples if as_tuples is True.
+    Records that do not match the format are skipped.
     """
     count = get_task_count()
-    for i in range(count):
-        task = read_task_by_index(i)
+    stop = count if stop is None else min(stop, count)
+    for chunk_start in range(start, stop, chunk):
+        data = db.read_records(chunk_start, min(chunk_start + chunk, stop))
+        for task_id, title, completed in RECORD_PATTERN.findall(data):
+            task_id = int(task_id)
+            title = title.decode(errors="replace").strip()
+            completed = completed == b"True "
+            if as_tuples:
+                yield task_id, title, completed
+            else:
+                yield {"id": task_id, "title": title, "completed": completed}
+
+
+def list_all_tasks():
+    """
+    Print all tasks from the file. Skips over deleted and invalid records.
+    """
+    for task in iter_tasks():
+        if task["title"] == "DELETED":
+            continue
+        status = "Done" if task["completed"] else "Not Done"
+        print(f"ID: {task['id']} | Title: {task['title']} | Completed: {status}")
+
+
+def load_title_index():
+    """
+    Load the saved title index, or rebuild it from the file if it is
+    missing or older than the data.
+    """
+    if title_index.load(index_path(DB_FILE), DB_FILE):
+        return
+    title_index.rebuild((task_id, title) for task_id, title, completed in iter_tasks(as_tuples=True)
+                        if title != "DELETED")
+
+
+def search_tasks(query: str, limit: int = 10):
+    """
+    Print the tasks whose titles best match the query.
+    """
+    results = title_index.search(query, limit)
+    if not results:
+        print("No matching tasks found.")
+    for task_id in results:
+        task = read_task(task_id)
         if task:
             status = "Done" if task["completed"] else "Not Done"
             print(f"ID: {task['id']} | Title: {task['title']} | Completed: {status}")
 
 
+def check_file(path: str = DB_FILE) -> list:
+    """
+    Return the indexes of records that are not well-formed, plus the file
+    size if it is not a whole number of records. An empty list means the
+    file is aligned and every record can be reached by index.
+    """
+    problems = []
+    with open(path, "rb") as f:
+        index = 0
+        while True:
+            record = f.read(RECORD_SIZE)
+            if not record:
+                break
+            if len(record) < RECORD_SIZE or not RECORD_PATTERN.fullmatch(record):
+                problems.append(index)
+            index += 1
+    size = os.path.getsize(path)
+    if size % RECORD_SIZE:
+        problems.append(size)
+    return problems
+
+
+def repair_file(path: str = DB_FILE) -> tuple:
+    """
+    Re-align a file damaged by records of the wrong length (older versions
+    padded titles to 50 characters rather than 50 bytes). Every line that
+    still looks like a record is re-encoded byte-exactly; anything else is
+    dropped. The original is kept as <path>.bak. Returns (kept, dropped).
+    """
+    line_pattern = re.compile(rb"(\d{4})\|(.*)\|(True |False)")
+    kept = dropped = 0
+    temp_path = path + ".tmp"
+    with open(path, "rb") as src, open(temp_path, "wb") as dst:
+        for line in src:
+            match = line_pattern.fullmatch(line.rstrip(b"\r\n"))  # Also CRLF line ends
+            if not match:
+                dropped += 1
+                continue
+            task_id, title, completed = match.groups()
+            dst.write(pack_task({
+                "id": int(task_id),
+                "title": title.decode("utf-8", errors="replace").strip(),
+                "completed": completed == b"True ",
+            }))
+            kept += 1
+        dst.flush()
+        os.fsync(dst.fileno())
+    os.replace(path, path + ".bak")
+    os.replace(temp_path, path)
+    return kept, dropped
+
+
+# The same 62-byte layout as pack_task(), as a NumPy structured dtype
+RECORD_DTYPE = None if np is None else np.dtype([
+    ("id", "S4"), ("sep1", "S1"), ("title", "S50"), ("sep2", "S1"), ("completed", "S5"), ("newline", "S1"),
+])
+DELETED_TITLE = encode_title("DELETED")
+DIGIT_WEIGHTS = None if np is None else np.array([1000, 100, 10, 1], dtype=np.uint32)
+
+
+def load_numpy(path: str = DB_FILE, mode: str = "r+"):
+    """
+    Map the task file as a NumPy record array without reading it into
+    memory. Changes made through the array go straight to the file; the
+    module's database is flushed first and its page cache dropped (again
+    by numpy_toggle()), so it never holds stale blocks. Do not mix this
+    with a shared database that other processes are writing.
+    """
+    if np is None:
+        raise ImportError("load_numpy() needs NumPy: pip install numpy")
+    if path == db.path:
+        db.invalidate()  # Make cached writes visible to the mapping
+    count = os.path.getsize(path) // RECORD_SIZE
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode=mode, shape=(count,))
+
+
+def numpy_ids(records):
+    """
+    Decode the 4-digit ID column of every record at once.
+    """
+    digits = np.ascontiguousarray(records).view(np.uint8).reshape(-1, RECORD_SIZE)[:, :4]
+    return (digits - ord("0")).astype(np.uint32) @ DIGIT_WEIGHTS
+
+
+def numpy_live(records):
+    """
+    Mask of the records that are not deleted.
+    """
+    return records["title"] != DELETED_TITLE
+
+
+def numpy_count_completed(records) -> int:
+    return int(np.count_nonzero(records["completed"] == b"True "))
+
+
+def numpy_id_range(records, low: int, high: int):
+    """
+    Mask of the live tasks whose IDs are in low..high (inclusive).
+    """
+    ids = numpy_ids(records)
+    return (ids >= low) & (ids <= high) & numpy_live(records)
+
+
+def numpy_title_prefix(records, prefix: str):
+    """
+    Mask of the live tasks whose titles start with prefix (case-sensitive).
+    """
+    return np.char.startswith(records["title"], prefix.encode("utf-8")) & numpy_live(records)
+
+
+def numpy_toggle(records, mask) -> int:
+    """
+    Flip the completed flag of every record in mask and write the change
+    to the file. Returns how many records were toggled.
+    """
+    column = records["completed"]
+    selected = column[mask]
+    column[mask] = np.where(selected == b"True ", b"False", b"True ")
+    if isinstance(records, np.memmap):
+        records.flush()
+        if records.filename == os.path.abspath(db.path):
+            db.invalidate()  # Cached blocks still hold the old flags
+    return len(selected)
+
+
 def main_menu():
+    load_slot_map()
+    load_title_index()
     while True:
         print("\n--- ToDo App ---")
         print("1. List tasks")
         print("2. Create task")
         print("3. Edit task")
         print("4. Delete task")
-        print("5. Exit")
+        print("5. Search tasks")
+        print("6. Exit")
         choice = input("Choose an option: ")
 
         if choice == "1":
@@ -171,11 +801,84 @@ def main_menu():
             task_id = int(input("Enter task ID to delete: "))
             delete_task(task_id)
         elif choice == "5":
+            search_tasks(input("Enter search words: "))
+        elif choice == "6":
+            db.close()
+            if not db.shared:  # Other processes may have changed the file under us
+                slot_map.save(db.path + MAP_SUFFIX, db.path)
+                title_index.save(index_path(DB_FILE), DB_FILE)
             print("Goodbye!")
             break
         else:
             print("Invalid choice. Please try again.")
 
 
+def stress_worker(number: int, operations: int):
+    use_shared_db()
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for i in range(operations):
+            if i % 2:
+                modify_task(1, lambda task: task.update(title=str(int(task["title"]) + 1)))
+            else:
+                create_task(f"worker {number} task {i}")
+    db.close()
+
+
+def stress_test(workers: int = 4, operations: int = 2000):
+    """
+    Run several processes against one shared database in a temporary
+    directory. Half of each worker's operations increment a counter held
+    in task 1, the other half create tasks. Afterwards the counter must
+    equal the number of increments and every created task must be there
+    with its own ID: a lost update or a clobbered append would show up.
+    """
+    import multiprocessing
+    import tempfile
+    import time
+
+    os.chdir(tempfile.mkdtemp(prefix="todo-stress-"))
+    use_shared_db()
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        create_task("0")
+    db.close()
+
+    started = time.perf_counter()
+    processes = [multiprocessing.Process(target=stress_worker, args=(number, operations))
+                 for number in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    tasks = list(iter_tasks())
+    increments = workers * (operations // 2)
+    creates = workers * (operations - operations // 2)
+    counter = int(read_task(1)["title"])
+    ids = {task["id"] for task in tasks}
+    print(f"{workers} processes x {operations} operations in {elapsed:.2f}s "
+          f"({workers * operations / elapsed:,.0f} ops/s)")
+    print(f"Counter: {counter} (expected {increments})")
+    print(f"Tasks: {len(tasks)} with {len(ids)} distinct IDs (expected {creates + 1})")
+    ok = counter == increments and len(tasks) == len(ids) == creates + 1 and not check_file()
+    print("No lost updates." if ok else "FAILED: updates were lost or records clobbered.")
+    return ok
+
+
 if __name__ == "__main__":
-    main_menu()
+    if len(sys.argv) > 1 and sys.argv[1] == "stress":
+        sys.exit(0 if stress_test(*(int(arg) for arg in sys.argv[2:4])) else 1)
+    if len(sys.argv) > 1 and sys.argv[1] == "--shared":
+        use_shared_db()
+        main_menu()
+    elif len(sys.argv) > 1 and sys.argv[1] in ("check", "repair"):
+        path = sys.argv[2] if len(sys.argv) > 2 else DB_FILE
+        if sys.argv[1] == "check":
+            problems = check_file(path)
+            print(f"{path} is aligned." if not problems else
+                  f"{path} has {len(problems)} misaligned or damaged records; run 'repair'.")
+        else:
+            kept, dropped = repair_file(path)
+            print(f"Repaired {path}: {kept} records kept, {dropped} dropped; original kept as {path}.bak")
+    else:
+        main_menu()
@@ -3,82 +3,48 @@ import sys
 import time
 from blessed import Terminal
 
+import task_model
+from task_views import FILTERS, SORT_KEYS, TaskView, next_name
+
 # -------------------------------------------------------------------------
 # 1) Task Classes (demonstrating inheritance)
 # -------------------------------------------------------------------------
-class Task:
-    """A simple Task class with an ID, title, and completion status."""
-    def __init__(self, task_id, title):
-        self.id = task_id
-        self.title = title
-        self.completed = False
-
-    def toggle_completion(self):
-        """Toggle the completion status of the task."""
-        self.completed = not self.completed
-
-    def __str__(self):
-        status = "✔" if self.completed else "✘"
-        return f"[{status}] {self.title}"
-
-class HighPriorityTask(Task):
+class Task(task_model.Task):
+    """A Task shown without its ID, e.g. "[✔] Buy milk"."""
+    __slots__ = ()
+    DISPLAY = "[{status}] {title}"
+
+
+class HighPriorityTask(task_model.HighPriorityTask):
     """
     A specialized Task that adds a 'priority' attribute.
-    Demonstrates inheritance from the base Task class.
+    Demonstrates inheritance from the shared HighPriorityTask class.
     """
-    def __init__(self, task_id, title, priority):
-        super().__init__(task_id, title)
-        self.priority = priority
+    __slots__ = ()
+    DISPLAY = Task.DISPLAY
 
-    def __str__(self):
-        status = "✔" if self.completed else "✘"
-        return f"[{status}] {self.title} (Priority: {self.priority})"
 
-# -------------------------------------------------------------------------
-# 2) ToDoList Class
-# -------------------------------------------------------------------------
-class ToDoList:
-    """Manages a collection (list) of Task objects."""
-    def __init__(self):
-        self.tasks = []
-
-    def add_task(self, title, priority=None):
-        new_id = len(self.tasks) + 1
-        if priority:
-            task = HighPriorityTask(new_id, title, priority)
-        else:
-            task = Task(new_id, title)
-        self.tasks.append(task)
-
-    def delete_task(self, index):
-        if 0 <= index < len(self.tasks):
-            del self.tasks[index]
-
-    def edit_task(self, index, new_title):
-        if 0 <= index < len(self.tasks):
-            self.tasks[index].title = new_title
-
-    def toggle_completion(self, index):
-        if 0 <= index < len(self.tasks):
-            self.tasks[index].toggle_completion()
+# The ToDoList model is shared, see task_model.py
 
 # -------------------------------------------------------------------------
-# 3) Blessed To-Do App
+# 2) Blessed To-Do App
 # -------------------------------------------------------------------------
 def main():
     term = Terminal()
-    todo = ToDoList()
+    todo = task_model.ToDoList(Task, HighPriorityTask)
+    view = TaskView(todo)  # The tasks as shown: sorted, filtered
+    filter_name = "all"
 
     # UI state variables
     mode = 'normal'  # Modes: normal, input_title, input_title_high, input_priority, edit
     title_input = ""
     priority_input = ""
     high_title = ""   # To store the title for a high-priority task
-    selected_index = 0
+    selected_index = 0  # Position in the view
 
     instructions = (
         "Commands: n = add normal, h = add high, e = edit, t = toggle, d = delete, "
-        "↑/↓ = move, q = quit"
+        "u = undo, r = redo, s = sort, f = filter, ↑/↓/PgUp/PgDn = move, q = quit"
     )
 
     with term.fullscreen(), term.cbreak(), term.hidden_cursor():
@@ -100,19 +66,22 @@ def main():
             else:
                 print(" " * term.width)  # blank line in normal mode
 
-            # Display the task list starting at a fixed row
-            print(term.underline("Tasks:"))
-            y = 0
-            if todo.tasks:
-                for idx, task in enumerate(todo.tasks):
-                    if idx == selected_index:
-                        line = term.reverse + f"{idx+1}. {task}" + term.normal
-                    else:
-                        line = f"{idx+1}. {task}"
-                    print(line)
-                    y += 1
-            else:
-                print("No tasks yet.")
+            # Display the page of tasks with the selected one, starting at a fixed row
+            rows = max(1, term.height - 8)  # Lines left under the header and above the footer
+            page = selected_index // rows
+            print(term.underline("Tasks:") + f" sorted by {view.sort}, showing {filter_name}, "
+                  f"page {page + 1}/{view.page_count(rows)}" + term.clear_eol)
+            tasks = view.page(page, rows)
+            for offset, task in enumerate(tasks):
+                idx = page * rows + offset
+                if idx == selected_index:
+                    line = term.reverse + f"{idx+1}. {task}" + term.normal
+                else:
+                    line = f"{idx+1}. {task}"
+                print(line + term.clear_eol)
+            if not view:
+                print("No tasks yet." + term.clear_eol)
+            print(term.clear_eos, end="")  # Blank the rest of a shorter page
             # Footer: display current mode info
             print(term.bold("Mode: " + mode))
             sys.stdout.flush()
@@ -135,23 +104,41 @@ def main():
                     mode = 'input_title_high'
                     title_input = ""
                 elif key == 'e':
-                    if todo.tasks:
+                    if view:
                         mode = 'edit'
-                        title_input = todo.tasks[selected_index].title
+                        title_input = view.task_at(selected_index).title
                 elif key == 't':
-                    if todo.tasks:
-                        todo.toggle_completion(selected_index)
+                    if view:
+                        todo.toggle_task(view.task_at(selected_index).id)
                 elif key == 'd':
-                    if todo.tasks:
-                        todo.delete_task(selected_index)
-                        if selected_index >= len(todo.tasks):
-                            selected_index = max(0, len(todo.tasks) - 1)
+                    if view:
+                        todo.delete_task(view.task_at(selected_index).id)
+                elif key == 'u':
+                    todo.undo()
+                elif key == 'r':
+                    todo.redo()
+                elif key in ('s', 'f'):
+                    sort = view.sort
+                    if key == 's':
+                        sort = next_name(SORT_KEYS, sort)
+                    else:
+                        filter_name = next_name(FILTERS, filter_name)
+                    view.close()
+                    view = TaskView(todo, sort, FILTERS[filter_name])
+                    selected_index = 0
                 elif key.code == term.KEY_DOWN:
-                    if selected_index < len(todo.tasks) - 1:
+                    if selected_index < len(view) - 1:
                         selected_index += 1
                 elif key.code == term.KEY_UP:
                     if selected_index > 0:
                         selected_index -= 1
+                elif key.code == term.KEY_PGDOWN:
+                    selected_index = max(0, min(selected_index + rows, len(view) - 1))
+                elif key.code == term.KEY_PGUP:
+                    selected_index = max(selected_index - rows, 0)
+                # Keep the selection on a task if tasks left the view
+                if selected_index >= len(view):
+                    selected_index = max(0, len(view) - 1)
             elif mode in ('input_title', 'input_title_high', 'edit'):
                 if key.code in (term.KEY_ENTER,):
                     if title_input.strip():
@@ -163,7 +150,7 @@ def main():
                             high_title = title_input.strip()
                             mode = 'input_priority'
                         elif mode == 'edit':
-                            todo.edit_task(selected_index, title_input.strip())
+                            todo.edit_task(view.task_at(selected_index).id, title_input.strip())
                             mode = 'normal'
                     title_input = ""
                 elif key.code in (term.KEY_BACKSPACE, term.KEY_DELETE):
@@ -1,79 +1,32 @@
 import pygame
 import sys
 
+import task_model
+from task_views import FILTERS, SORT_KEYS, TaskView, next_name
+
 # -------------------------------------------------
 #  1) Task Classes (Inheritance Demo)
 # -------------------------------------------------
-class Task:
-    """A simple Task class with an ID, title, and completion status."""
-    def __init__(self, task_id, title):
-        self.id = task_id
-        self.title = title
-        self.completed = False
-
-    def toggle_completion(self):
-        """Toggle the completion status of the task."""
-        self.completed = not self.completed
-
-    def __str__(self):
-        status = "✔" if self.completed else "✘"
-        return f"[{status}] {self.title}"
+class Task(task_model.Task):
+    """A Task shown without its ID, e.g. "[✔] Buy milk"."""
+    __slots__ = ()
+    DISPLAY = "[{status}] {title}"
 
 
-class HighPriorityTask(Task):
+class HighPriorityTask(task_model.HighPriorityTask):
     """
     A specialized Task that adds a 'priority' attribute.
-    Demonstrates inheritance from the base Task class.
+    Demonstrates inheritance from the shared HighPriorityTask class.
     """
-    def __init__(self, task_id, title, priority):
-        super().__init__(task_id, title)
-        self.priority = priority
+    __slots__ = ()
+    DISPLAY = Task.DISPLAY
 
-    def __str__(self):
-        status = "✔" if self.completed else "✘"
-        return f"[{status}] {self.title} (Priority: {self.priority})"
 
-
-# -------------------------------------------------
-#  2) ToDoList Class
-# -------------------------------------------------
-class ToDoList:
-    """
-    Manages a collection (list) of Task objects.
-    """
-    def __init__(self):
-        self.tasks = []
-
-    def add_task(self, title, priority=None):
-        """
-        Create and add a Task (normal or high-priority).
-        If 'priority' is provided, a HighPriorityTask is created.
-        """
-        new_id = len(self.tasks) + 1
-        if priority:
-            task = HighPriorityTask(new_id, title, priority)
-        else:
-            task = Task(new_id, title)
-        self.tasks.append(task)
-
-    def delete_task(self, index):
-        """Delete a task by its index in the list."""
-        if 0 <= index < len(self.tasks):
-            self.tasks.pop(index)
-
-    def edit_task(self, index, new_title):
-        """Edit the title of an existing task."""
-        if 0 <= index < len(self.tasks):
-            self.tasks[index].title = new_title
-
-    def toggle_completion(self, index):
-        """Toggle completion for a task by index."""
-        if 0 <= index < len(self.tasks):
-            self.tasks[index].toggle_completion()
+# The ToDoList model is shared, see task_model.py
 
 
 # -------------------------------------------------
-#  3) PyGame-based UI
+#  2) PyGame-based UI
 # -------------------------------------------------
 class ToDoApp:
     """
@@ -83,7 +36,7 @@ class ToDoApp:
     def __init__(self):
         pygame.init()
         self.screen_width = 640
-        self.screen_height = 480
+        self.screen_height = 600
         self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
         pygame.display.set_caption("PyGame To-Do List")
 
@@ -91,10 +44,12 @@ class ToDoApp:
         self.font = pygame.font.SysFont("Arial", 24)
         self.small_font = pygame.font.SysFont("Arial", 20)
 
-        self.todo_list = ToDoList()
+        self.todo_list = task_model.ToDoList(Task, HighPriorityTask)
+        self.view = TaskView(self.todo_list)  # The tasks as shown: sorted, filtered
 
         # State variables
-        self.selected_index = 0  # Which task is "selected"
+        self.selected_index = 0  # Which task in the view is "selected"
+        self.filter_name = "all"
         self.input_mode = None   # "normal", "high", "edit", or None
         self.input_text = ""     # Buffer for typing titles
 
@@ -106,12 +61,14 @@ class ToDoApp:
         # Instructions
         self.instructions = [
             "Keyboard Shortcuts:",
-            " Arrows Up/Down: select task",
+            " Arrows Up/Down, PgUp/PgDn: select task",
             " N: Add normal task",
             " H: Add high-priority task",
             " T: Toggle completion",
             " E: Edit selected task",
             " D: Delete selected task",
+            " U / R: Undo / redo",
+            " S / F: Change sorting / filter",
             " Enter: confirm text input",
             " ESC: exit or cancel input",
         ]
@@ -145,9 +102,17 @@ class ToDoApp:
             if key == pygame.K_ESCAPE:
                 return False  # Quit
             elif key == pygame.K_DOWN:
-                self.selected_index = min(self.selected_index + 1, len(self.todo_list.tasks) - 1)
+                self.selected_index = max(0, min(self.selected_index + 1, len(self.view) - 1))
             elif key == pygame.K_UP:
                 self.selected_index = max(self.selected_index - 1, 0)
+            elif key == pygame.K_PAGEDOWN:
+                self.selected_index = max(0, min(self.selected_index + self.rows_per_page(), len(self.view) - 1))
+            elif key == pygame.K_PAGEUP:
+                self.selected_index = max(self.selected_index - self.rows_per_page(), 0)
+            elif key == pygame.K_s:
+                self.change_view(sort=next_name(SORT_KEYS, self.view.sort))
+            elif key == pygame.K_f:
+                self.change_view(filter_name=next_name(FILTERS, self.filter_name))
             elif key == pygame.K_n:
                 # Enter normal task input mode
                 self.input_mode = "normal"
@@ -157,18 +122,27 @@ class ToDoApp:
                 self.input_mode = "high"
                 self.input_text = ""
             elif key == pygame.K_t:
-                self.todo_list.toggle_completion(self.selected_index)
+                task = self.selected_task()
+                if task is not None:
+                    self.todo_list.toggle_task(task.id)
+                    self.clamp_selection()  # It may have left the filtered view
             elif key == pygame.K_d:
-                self.todo_list.delete_task(self.selected_index)
-                # Adjust selected index if it goes out of range
-                if self.selected_index >= len(self.todo_list.tasks):
-                    self.selected_index = max(0, len(self.todo_list.tasks) - 1)
+                task = self.selected_task()
+                if task is not None:
+                    self.todo_list.delete_task(task.id)
+                    self.clamp_selection()
+            elif key == pygame.K_u:
+                self.todo_list.undo()
+                self.clamp_selection()
+            elif key == pygame.K_r:
+                self.todo_list.redo()
+                self.clamp_selection()
             elif key == pygame.K_e:
                 # Enter edit mode
-                if self.todo_list.tasks:
-                    current_title = self.todo_list.tasks[self.selected_index].title
+                task = self.selected_task()
+                if task is not None:
                     self.input_mode = "edit"
-                    self.input_text = current_title
+                    self.input_text = task.title
             else:
                 pass
         else:
@@ -191,6 +165,35 @@ class ToDoApp:
 
         return True
 
+    def clamp_selection(self):
+        """Keeps the selection on a task after tasks were removed."""
+        self.selected_index = max(0, min(self.selected_index, len(self.view) - 1))
+
+    def select(self, task):
+        """Moves the selection to a task, if the view shows it."""
+        index = self.view.index_of(task.id)
+        if index is not None:
+            self.selected_index = index
+
+    def selected_task(self):
+        """The task under the selection bar, or None if the view is empty."""
+        if not 0 <= self.selected_index < len(self.view):
+            return None
+        return self.view.task_at(self.selected_index)
+
+    def change_view(self, sort=None, filter_name=None):
+        """Shows the tasks sorted or filtered differently."""
+        self.filter_name = filter_name or self.filter_name
+        self.view.close()
+        self.view = TaskView(self.todo_list, sort or self.view.sort, FILTERS[self.filter_name])
+        self.selected_index = 0
+
+    def rows_per_page(self):
+        """How many tasks fit between the instructions and the input prompt."""
+        tasks_top = self.margin + len(self.instructions) * self.line_spacing_instructions + 40
+        tasks_bottom = self.screen_height - self.margin - self.line_spacing_tasks
+        return max(1, (tasks_bottom - tasks_top) // self.line_spacing_tasks)
+
     def confirm_input(self):
         """
         Called when user presses Enter in an input mode.
@@ -201,16 +204,17 @@ class ToDoApp:
             return
 
         if self.input_mode == "normal":
-            self.todo_list.add_task(text)
-            self.selected_index = len(self.todo_list.tasks) - 1
+            self.select(self.todo_list.add_task(text))
 
         elif self.input_mode == "high":
             # We'll just default the priority to "High" for simplicity
-            self.todo_list.add_task(text, priority="High")
-            self.selected_index = len(self.todo_list.tasks) - 1
+            self.select(self.todo_list.add_task(text, priority="High"))
 
         elif self.input_mode == "edit":
-            self.todo_list.edit_task(self.selected_index, text)
+            task = self.selected_task()
+            if task is not None:  # The view may have changed since editing began
+                self.todo_list.edit_task(task.id, text)
+                self.select(task)  # Sorted by title, it may have moved
 
         # Reset input state
         self.input_mode = None
@@ -246,10 +250,15 @@ class ToDoApp:
             self.screen.blit(text_surf, (x_offset, y_offset))
             y_offset += self.line_spacing_instructions
 
-        # 2) Draw tasks
-        y_offset += 10  # Extra gap between instructions and tasks
-        for i, task in enumerate(self.todo_list.tasks):
-            color = (255, 255, 255) if i == self.selected_index else (180, 180, 180)
+        # 2) Draw the page of tasks with the selected one (only the visible rows)
+        rows = self.rows_per_page()
+        page = self.selected_index // rows
+        status = (f"Sorted by {self.view.sort}, showing {self.filter_name} "
+                  f"| Page {page + 1}/{self.view.page_count(rows)}")
+        self.screen.blit(self.small_font.render(status, True, (120, 180, 255)), (x_offset, y_offset))
+        y_offset += self.line_spacing_instructions + 15
+        for i, task in enumerate(self.view.page(page, rows)):
+            color = (255, 255, 255) if page * rows + i == self.selected_index else (180, 180, 180)
             text = f"{task.id}. {str(task)}"
             text_surf = self.font.render(text, True, color)
             # Indent tasks a bit from the left
@@ -10,73 +10,18 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QMessageBox,
     QInputDialog,
-    QLabel
+    QLabel,
+    QShortcut
 )
+from PyQt5.QtGui import QKeySequence
 
-# -----------------------------------------
-#  1) Task Classes
-# -----------------------------------------
-class Task:
-    """
-    A simple Task class with an ID, title, and completion status.
-    """
-    def __init__(self, task_id, title):
-        self.id = task_id
-        self.title = title
-        self.completed = False
-
-    def toggle_completion(self):
-        """Toggle the completion status of the task."""
-        self.completed = not self.completed
-
-    def __str__(self):
-        status = "✔" if self.completed else "✘"
-        return f"ID: {self.id} | [{status}] {self.title}"
-
-
-class HighPriorityTask(Task):
-    """
-    A specialized Task with a 'priority' attribute.
-    Demonstrates inheritance from the base Task class.
-    """
-    def __init__(self, task_id, title, priority):
-        super().__init__(task_id, title)
-        self.priority = priority
+from task_model import ToDoList
 
-    def __str__(self):
-        status = "✔" if self.completed else "✘"
-        return f"ID: {self.id} | [{status}] {self.title} (Priority: {self.priority})"
+# The Task classes and the ToDoList model live in task_model.py
 
 
 # -----------------------------------------
-#  2) ToDoList Class
-# -----------------------------------------
-class ToDoList:
-    """
-    Manages a collection (list) of Task objects.
-    """
-    def __init__(self):
-        self.tasks = []
-
-    def add_task(self, title):
-        """
-        Creates a standard Task and adds it to the list.
-        """
-        new_id = len(self.tasks) + 1
-        task = Task(new_id, title)
-        self.tasks.append(task)
-
-    def add_high_priority_task(self, title, priority):
-        """
-        Creates a HighPriorityTask and adds it to the list.
-        """
-        new_id = len(self.tasks) + 1
-        task = HighPriorityTask(new_id, title, priority)
-        self.tasks.append(task)
-
-
-# -----------------------------------------
-#  3) MainWindow (The PyQt GUI)
+#  1) MainWindow (The PyQt GUI)
 # -----------------------------------------
 class MainWindow(QMainWindow):
     """
@@ -154,8 +99,19 @@ class MainWindow(QMainWindow):
         btn_refresh.clicked.connect(self.refresh_list)
         action_button_layout.addWidget(btn_refresh)
 
+        btn_undo = QPushButton("Undo")
+        btn_undo.clicked.connect(self.undo)
+        action_button_layout.addWidget(btn_undo)
+
+        btn_redo = QPushButton("Redo")
+        btn_redo.clicked.connect(self.redo)
+        action_button_layout.addWidget(btn_redo)
+
         main_layout.addLayout(action_button_layout)
 
+        QShortcut(QKeySequence.Undo, self, activated=self.undo)
+        QShortcut(QKeySequence.Redo, self, activated=self.redo)
+
     # -----------------------------------------
     #  Helper Methods (Slots)
     # -----------------------------------------
@@ -179,7 +135,7 @@ class MainWindow(QMainWindow):
         if title:
             priority, ok = QInputDialog.getText(self, "High Priority Task", "Enter priority (e.g. High, Medium, Low):")
             if ok and priority:
-                self.todo_list.add_high_priority_task(title, priority)
+                self.todo_list.add_task(title, priority)
                 self.title_edit.clear()
                 self.refresh_list()
             else:
@@ -196,12 +152,12 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Warning", "No task selected.")
             return
 
-        selected_task = self.todo_list.tasks[index]
+        selected_task = self.todo_list.task_at(index)
         new_title, ok = QInputDialog.getText(
             self, "Edit Task", "New title:", text=selected_task.title
         )
         if ok and new_title:
-            selected_task.title = new_title
+            self.todo_list.edit_task(selected_task.id, new_title)
             self.refresh_list()
 
     def delete_task(self):
@@ -214,7 +170,7 @@ class MainWindow(QMainWindow):
             return
 
         # Remove the task from the list
-        self.todo_list.tasks.pop(index)
+        self.todo_list.delete_task(self.todo_list.task_at(index).id)
         self.refresh_list()
 
     def toggle_completion(self):
@@ -226,21 +182,33 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Warning", "No task selected.")
             return
 
-        task = self.todo_list.tasks[index]
-        task.toggle_completion()
+        self.todo_list.toggle_task(self.todo_list.task_at(index).id)
         self.refresh_list()
 
+    def undo(self):
+        """
+        Undo the last change.
+        """
+        if self.todo_list.undo():
+            self.refresh_list()
+
+    def redo(self):
+        """
+        Redo the last undone change.
+        """
+        if self.todo_list.redo():
+            self.refresh_list()
+
     def refresh_list(self):
         """
         Refresh the QListWidget to display the latest tasks.
         """
         self.task_list_widget.clear()
-        for task in self.todo_list.tasks:
-            self.task_list_widget.addItem(str(task))
+        self.task_list_widget.addItems([str(task) for task in self.todo_list])
 
 
 # -----------------------------------------
-#  4) Entry Point
+#  2) Entry Point
 # -----------------------------------------
 def main():
     app = QApplication(sys.argv)
@@ -12,58 +12,18 @@ from textual.widgets import (
 )
 from textual.reactive import var
 
+import task_model
+
 # -------------------------------------------------------------------------
-# 1) Model Classes
+# 1) Model Classes (the ToDoList itself is shared, see task_model.py)
 # -------------------------------------------------------------------------
-class Task:
-    def __init__(self, task_id: int, title: str):
-        self.id = task_id
-        self.title = title
-        self.completed = False
-
-    def toggle(self) -> None:
-        self.completed = not self.completed
-
-    def __str__(self) -> str:
-        return f"{'✔' if self.completed else '✘'} {self.title}"
-
-class HighPriorityTask(Task):
-    def __init__(self, task_id: int, title: str, priority: str):
-        super().__init__(task_id, title)
-        self.priority = priority
-
-    def __str__(self) -> str:
-        return f"{'✔' if self.completed else '✘'} {self.title} (Priority: {self.priority})"
-
-class ToDoList:
-    def __init__(self) -> None:
-        self.tasks: list[Task] = []
-
-    def add_task(self, title: str, priority: str = None) -> None:
-        new_id = len(self.tasks) + 1
-        if priority:
-            task = HighPriorityTask(new_id, title, priority)
-        else:
-            task = Task(new_id, title)
-        self.tasks.append(task)
-
-    def delete_task(self, task_id: int) -> None:
-        self.tasks = [t for t in self.tasks if t.id != task_id]
-
-    def edit_task(self, task_id: int, new_title: str) -> None:
-        for t in self.tasks:
-            if t.id == task_id:
-                t.title = new_title
-                break
+class Task(task_model.Task):
+    __slots__ = ()
+    DISPLAY = "{status} {title}"
 
-    def toggle_task(self, task_id: int) -> None:
-        for t in self.tasks:
-            if t.id == task_id:
-                t.toggle()
-                break
-
-    def clear_tasks(self) -> None:
-        self.tasks = []
+class HighPriorityTask(task_model.HighPriorityTask):
+    __slots__ = ()
+    DISPLAY = Task.DISPLAY
 
 
 # -------------------------------------------------------------------------
@@ -73,12 +33,12 @@ class ToDoApp(App):
     CSS = """
     # ... (Your CSS)
     """
-    BINDINGS = [("q", "quit", "Quit")]
+    BINDINGS = [("q", "quit", "Quit"), ("ctrl+z", "undo", "Undo"), ("ctrl+y", "redo", "Redo")]
     selected_task_id = var(None)
 
     def __init__(self):
         super().__init__()
-        self.todo = ToDoList()
+        self.todo = task_model.ToDoList(Task, HighPriorityTask)
 
     def compose(self):
         yield Header("OO To-Do App", id="header")
@@ -93,6 +53,8 @@ class ToDoApp(App):
             Button("Toggle", variant="warning", id="toggle"),
             Button("Delete", variant="error", id="delete"),
             Button("Clear All", variant="error", id="clear_all"),
+            Button("Undo", id="undo"),
+            Button("Redo", id="redo"),
             classes="buttons-panel"
         )
         yield Horizontal(tasks_table, buttons_panel)
@@ -106,7 +68,7 @@ class ToDoApp(App):
     def _load_tasks(self):
         dt = self.query_one(DataTable)
         dt.clear()
-        for task in self.todo.tasks:
+        for task in self.todo:
             status = "✔" if task.completed else "✘"
             priority = getattr(task, "priority", "")
             dt.add_row(str(task.id), task.title, priority, status, key=str(task.id))
@@ -139,9 +101,10 @@ class ToDoApp(App):
         if self.selected_task_id is None:
             return
 
-        current_title = next((task.title for task in self.todo.tasks if task.id == self.selected_task_id), None)
-        if current_title is None:
+        task = self.todo.get(self.selected_task_id)
+        if task is None:
             return
+        current_title = task.title
 
         def callback(result):
             if result:
@@ -166,9 +129,10 @@ class ToDoApp(App):
         if self.selected_task_id is None:
             return
 
-        task_title = next((task.title for task in self.todo.tasks if task.id == self.selected_task_id), None)
-        if task_title is None:
+        task = self.todo.get(self.selected_task_id)
+        if task is None:
             return
+        task_title = task.title
 
         def check_answer(accepted):  # Callback for the QuestionDialog
             if accepted:
@@ -185,6 +149,16 @@ class ToDoApp(App):
 
         self.push_screen(QuestionDialog("Clear all tasks?"), check_answer)
 
+    @on(Button.Pressed, "#undo")
+    def action_undo(self):
+        if self.todo.undo():  # Also brings back everything "Clear All" removed
+            self._load_tasks()
+
+    @on(Button.Pressed, "#redo")
+    def action_redo(self):
+        if self.todo.redo():
+            self._load_tasks()
+
     async def on_key(self, event) -> None:
         if event.key.lower() == "q":
             await self.action_quit()
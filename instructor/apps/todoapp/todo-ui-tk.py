@@ -1,71 +1,10 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 
+from task_model import ToDoList
 
-# -----------------------------
-#    Task Classes
-# -----------------------------
-class Task:
-    """
-    A simple Task class with an ID, title, and completion status.
-    """
-    def __init__(self, task_id, title):
-        self.id = task_id
-        self.title = title
-        self.completed = False
-
-    def toggle_completion(self):
-        """Toggle the completion status of the task."""
-        self.completed = not self.completed
-
-    def __str__(self):
-        status = "✔" if self.completed else "✘"
-        return f"ID: {self.id} | [{status}] {self.title}"
-
-
-class HighPriorityTask(Task):
-    """
-    A specialized Task with a 'priority' attribute. Demonstrates inheritance.
-    """
-    def __init__(self, task_id, title, priority):
-        super().__init__(task_id, title)
-        self.priority = priority
-
-    def __str__(self):
-        status = "✔" if self.completed else "✘"
-        return f"ID: {self.id} | [{status}] {self.title} (Priority: {self.priority})"
-
-
-# -----------------------------
-#    To-Do List Class
-# -----------------------------
-class ToDoList:
-    """
-    Manages a collection (list) of tasks.
-    """
-    def __init__(self):
-        self.tasks = []
 
-    def add_task(self, title, high_priority=False):
-        """
-        Adds a normal Task or a HighPriorityTask (if high_priority=True).
-        """
-        new_id = len(self.tasks) + 1
-        if high_priority:
-            # In a GUI flow, we might ask for the priority via a popup
-            # but let's handle that outside for clarity.
-            pass
-        else:
-            new_task = Task(new_id, title)
-            self.tasks.append(new_task)
-
-    def add_high_priority_task(self, title, priority):
-        """
-        Creates and adds a HighPriorityTask.
-        """
-        new_id = len(self.tasks) + 1
-        new_task = HighPriorityTask(new_id, title, priority)
-        self.tasks.append(new_task)
+# The Task classes and the ToDoList model live in task_model.py
 
 
 # -----------------------------
@@ -78,7 +17,7 @@ class ToDoApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("To-Do List GUI")
-        self.geometry("400x300")
+        self.geometry("400x340")
 
         # Create an instance of our ToDoList to manage tasks
         self.todo_list = ToDoList()
@@ -136,12 +75,27 @@ class ToDoApp(tk.Tk):
         )
         btn_refresh.grid(row=2, column=1, padx=5, pady=5)
 
+        btn_undo = tk.Button(
+            button_frame, text="Undo",
+            command=self.undo
+        )
+        btn_undo.grid(row=3, column=0, padx=5, pady=5)
+
+        btn_redo = tk.Button(
+            button_frame, text="Redo",
+            command=self.redo
+        )
+        btn_redo.grid(row=3, column=1, padx=5, pady=5)
+
+        self.bind("<Control-z>", lambda event: self.undo())
+        self.bind("<Control-y>", lambda event: self.redo())
+
     # --- Helper Methods ---
     def add_normal_task(self):
         """Add a normal task to the to-do list."""
         title = self.title_entry.get().strip()
         if title:
-            self.todo_list.add_task(title, high_priority=False)
+            self.todo_list.add_task(title)
             self.title_entry.delete(0, tk.END)
             self.refresh_task_list()
         else:
@@ -153,7 +107,7 @@ class ToDoApp(tk.Tk):
         if title:
             priority = simpledialog.askstring("Priority", "Enter the task priority (e.g., High, Medium, Low):")
             if priority:
-                self.todo_list.add_high_priority_task(title, priority)
+                self.todo_list.add_task(title, priority)
                 self.title_entry.delete(0, tk.END)
                 self.refresh_task_list()
             else:
@@ -165,32 +119,40 @@ class ToDoApp(tk.Tk):
         """Edit the selected task's title."""
         selected_index = self.get_selected_task_index()
         if selected_index is not None:
-            selected_task = self.todo_list.tasks[selected_index]
+            selected_task = self.todo_list.task_at(selected_index)
             new_title = simpledialog.askstring("Edit Task", "Enter new title:", initialvalue=selected_task.title)
             if new_title:
-                selected_task.title = new_title
+                self.todo_list.edit_task(selected_task.id, new_title)
                 self.refresh_task_list()
 
     def delete_task(self):
         """Delete the selected task."""
         selected_index = self.get_selected_task_index()
         if selected_index is not None:
-            self.todo_list.tasks.pop(selected_index)
+            self.todo_list.delete_task(self.todo_list.task_at(selected_index).id)
             self.refresh_task_list()
 
     def toggle_completion(self):
         """Toggle the completion status of the selected task."""
         selected_index = self.get_selected_task_index()
         if selected_index is not None:
-            task = self.todo_list.tasks[selected_index]
-            task.toggle_completion()
+            self.todo_list.toggle_task(self.todo_list.task_at(selected_index).id)
+            self.refresh_task_list()
+
+    def undo(self):
+        """Undo the last change."""
+        if self.todo_list.undo():
+            self.refresh_task_list()
+
+    def redo(self):
+        """Redo the last undone change."""
+        if self.todo_list.redo():
             self.refresh_task_list()
 
     def refresh_task_list(self):
         """Refresh the listbox with the latest tasks."""
         self.task_listbox.delete(0, tk.END)
-        for task in self.todo_list.tasks:
-            self.task_listbox.insert(tk.END, str(task))
+        self.task_listbox.insert(tk.END, *(str(task) for task in self.todo_list))
 
     def get_selected_task_index(self):
         """
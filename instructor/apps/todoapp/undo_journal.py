@@ -0,0 +1,107 @@
+"""
+Multi-level undo and redo for the todo models.
+
+Every change a model makes is recorded as the one call that reverts it,
+e.g. adding a task records ("delete_task", task_id) and deleting it
+records ("restore_task", task, ...). Undoing a step just makes that call
+on the model, which in turn records the call that redoes the step, so no
+copies of the task list are ever kept and each step is O(1) here.
+
+The journal keeps at most `limit` steps in memory. Older steps are
+forgotten, or with spill=True written to a temporary file and read back
+when the undo stack reaches them, so the undo history is only bounded by
+the disk.
+"""
+import pickle
+import tempfile
+from array import array
+from collections import deque
+
+UNDO_LIMIT = 100  # Undo steps kept in memory
+
+
+class UndoJournal:
+    """The undo and redo stacks of one model."""
+
+    def __init__(self, limit=UNDO_LIMIT, spill=False):
+        self.limit = limit
+        self.spill = spill
+        self.undo_steps = deque()
+        self.redo_steps = deque(maxlen=limit)
+        self.spill_file = None
+        self.spill_offsets = array("Q")  # Where each spilled step starts, oldest first
+        self.replaying = None            # "undo" or "redo" while a step is being replayed
+
+    def __len__(self):
+        return len(self.undo_steps) + len(self.spill_offsets)
+
+    @property
+    def can_undo(self):
+        return len(self) > 0
+
+    @property
+    def can_redo(self):
+        return len(self.redo_steps) > 0
+
+    def record(self, step):
+        """Called by the model with the call that reverts the change it just made."""
+        if self.replaying == "undo":
+            self.redo_steps.append(step)
+            return
+        if self.replaying is None and self.redo_steps:
+            self.redo_steps = deque(maxlen=self.limit)  # A new change ends the redo history
+        self.undo_steps.append(step)
+        if len(self.undo_steps) > self.limit:
+            self.spill_step(self.undo_steps.popleft())
+
+    def undo(self, model):
+        """Reverts the last change to model. Returns False if there is none."""
+        step = self.undo_steps.pop() if self.undo_steps else self.unspill_step()
+        if step is None:
+            return False
+        self.replay(model, step, "undo")
+        return True
+
+    def redo(self, model):
+        """Makes the last undone change again. Returns False if there is none."""
+        if not self.redo_steps:
+            return False
+        self.replay(model, self.redo_steps.pop(), "redo")
+        return True
+
+    def replay(self, model, step, direction):
+        name, *args = step
+        self.replaying = direction
+        try:
+            getattr(model, name)(*args)
+        finally:
+            self.replaying = None
+
+    def clear(self):
+        """Forgets all undo and redo steps."""
+        self.undo_steps = deque()
+        self.redo_steps = deque(maxlen=self.limit)
+        del self.spill_offsets[:]
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+
+    # --- Spilling old steps to disk ---
+    def spill_step(self, step):
+        if not self.spill:
+            return  # Forget the oldest step
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile()  # Deleted when closed
+        self.spill_file.seek(0, 2)
+        self.spill_offsets.append(self.spill_file.tell())
+        pickle.dump(step, self.spill_file, pickle.HIGHEST_PROTOCOL)
+
+    def unspill_step(self):
+        """Reads back the newest spilled step, or returns None."""
+        if not self.spill_offsets:
+            return None
+        offset = self.spill_offsets.pop()
+        self.spill_file.seek(offset)
+        step = pickle.load(self.spill_file)
+        self.spill_file.truncate(offset)
+        return step